@@ -0,0 +1,233 @@
+"""
+Benchmark
+Headless timings and peak memory for collection hot paths on synthetic collections
+
+    python benchmark.py                          # 1k, 10k and 100k records
+    python benchmark.py --sizes 1000,5000 --output before.json
+    python benchmark.py --compare before.json    # exit status 1 on regressions
+
+Results are written as JSON (one entry per size and operation) so runs on
+the same machine can be compared before pushing an update to the kiosks.
+"""
+import os
+
+# Kivy runs without a window: widgets are built against a no-op GL backend
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+# Keep Kivy from taking over stderr, where the progress table goes
+os.environ.setdefault('KIVY_LOG_MODE', 'PYTHON')
+os.environ.setdefault('KIVY_GL_BACKEND', 'mock')
+os.environ.setdefault('KCFG_GRAPHICS_MAXFPS', '0')
+
+import argparse
+import gc
+import json
+import logging
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from collection_store import CollectionStore
+from discogs_service import DiscogsService
+from genre_index import GenreIndex, MOOD_MAP
+from records import Record
+from synthetic import synthetic_collection
+
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+
+# Queries run against every size: (name, query)
+SEARCH_QUERIES = (
+    ('one_letter', 'b'),
+    ('prefix', 'ele'),
+    ('word', 'night'),
+    ('genre', 'jazz'),
+    ('two_words', 'blue night'),
+    ('miss', 'zzzz'),
+)
+
+
+def measure(operation, repeat, setup=None):
+    """Timings (ms) over `repeat` runs, plus peak traced memory (KiB) of one more run"""
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        gc.collect()
+        start = time.perf_counter()
+        operation()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    # Traced separately - tracemalloc slows everything down
+    if setup:
+        setup()
+    gc.collect()
+    tracemalloc.start()
+    operation()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'ms_min': round(min(timings), 3),
+        'ms_median': round(statistics.median(timings), 3),
+        'ms_mean': round(statistics.mean(timings), 3),
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+
+def benchmark_ui(service, records, repeat):
+    """CollectionScreen.load_albums with the collection bound, including the grid layout pass"""
+    # Kivy logs GL and input provider failures; a headless run expects them
+    kivy_log = logging.getLogger('kivy')
+    kivy_log.addHandler(logging.NullHandler())
+    kivy_log.propagate = False
+
+    try:
+        from kivy.clock import Clock
+        from screens.collection_screen import CollectionScreen
+    except Exception as e:
+        return {'skipped': f"Kivy unavailable: {e}"}
+
+    # Screens find the service through App.get_running_app(), which returns
+    # the most recently created App - no need to run it
+    from kivy.app import App
+    App().discogs = service
+    # The grid asks for visible covers; downloads aren't part of the benchmark
+    service.prioritize_covers = lambda albums: None
+    screens = []
+
+    def setup():
+        screens[:] = [CollectionScreen(name='collection', size=(800, 480))]
+
+    def load_albums():
+        screens[-1].load_albums(0)
+        Clock.tick()  # lets the RecycleView lay out and bind its visible cards
+
+    return measure(load_albums, repeat, setup=setup)
+
+
+def run_size(size, repeat, ui=True):
+    """Every benchmark for one collection size"""
+    results = []
+
+    def record(operation, outcome):
+        results.append({'size': size, 'operation': operation, **outcome})
+        if 'skipped' in outcome:
+            print(f"  {operation:<28} skipped ({outcome['skipped']})", file=sys.stderr)
+        else:
+            print(f"  {operation:<28} {outcome['ms_median']:>10.3f} ms   {outcome['peak_kib']:>10.1f} KiB peak",
+                  file=sys.stderr)
+
+    print(f"{size} records", file=sys.stderr)
+    records = synthetic_collection(size)
+    dicts = [item.to_dict() for item in records]
+    record('records_from_dicts', measure(lambda: [Record.from_dict(item) for item in dicts], repeat))
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        service = DiscogsService('benchmark-token', 'benchmark', cache_dir)
+        record('set_collection', measure(lambda: service.set_collection(records), repeat))
+
+        for name, query in SEARCH_QUERIES:
+            record(f'search_{name}', measure(
+                lambda: service.search_collection(query, limit=100), repeat,
+                setup=service.search_index.clear_cache
+            ))
+        record('search_cached', measure(lambda: service.search_collection('blue night', limit=100), repeat))
+
+        moods = list(MOOD_MAP)
+        record('random_by_mood', measure(lambda: [service.get_random_by_mood(mood) for mood in moods], repeat))
+
+        def fresh_genre_index():
+            service.genre_index = GenreIndex(records)
+        record('all_genres_cold', measure(service.get_all_genres, repeat, setup=fresh_genre_index))
+        record('all_genres_cached', measure(service.get_all_genres, repeat))
+
+        store = CollectionStore(cache_dir)
+        record('cache_write', measure(lambda: store.replace(records), repeat))
+        record('cache_load', measure(store.load, repeat))
+        record('cache_load_first_page', measure(lambda: store.load(limit=100), repeat))
+
+        if ui:
+            record('collection_load_albums', benchmark_ui(service, records, repeat))
+
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare(results, baseline_path, threshold):
+    """Print timing ratios against a previous run; returns the regressed operations"""
+    with open(baseline_path, 'r') as f:
+        baseline = {(entry['size'], entry['operation']): entry for entry in json.load(f)['results']}
+
+    regressions = []
+    print(f"\nCompared with {baseline_path} (regression above {threshold:.2f}x):", file=sys.stderr)
+    for entry in results:
+        before = baseline.get((entry['size'], entry['operation']))
+        if not before or 'ms_median' not in entry or 'ms_median' not in before:
+            continue
+        # Sub-millisecond timings are too noisy to compare as ratios
+        ratio = entry['ms_median'] / max(before['ms_median'], 0.05)
+        marker = ''
+        if ratio > threshold and entry['ms_median'] - before['ms_median'] > 0.05:
+            regressions.append(entry)
+            marker = '  << REGRESSION'
+        print(f"  {entry['size']:>7} {entry['operation']:<28} {ratio:>6.2f}x{marker}", file=sys.stderr)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+                        help='comma-separated collection sizes')
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per operation')
+    parser.add_argument('--output', help='write JSON results here instead of stdout')
+    parser.add_argument('--compare', metavar='BASELINE', help='JSON from an earlier run to compare against')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='slowdown ratio counted as a regression (default 1.25)')
+    parser.add_argument('--no-ui', action='store_true', help='skip the Kivy screen benchmarks')
+    args = parser.parse_args()
+
+    results = []
+    for size in (int(size) for size in args.sizes.split(',')):
+        results.extend(run_size(size, args.repeat, ui=not args.no_ui))
+
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        # ru_maxrss is KiB on Linux
+        'max_rss_kib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'results': results,
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+Cache Files
+Crash-safe writes and integrity checks for files in the cache directory
+"""
+import os
+import sqlite3
+import tempfile
+
+
+# Suffix of in-progress writes; anything left with it is from an interrupted write
+PARTIAL_SUFFIX = '.part'
+QUARANTINE_DIR = 'quarantine'
+
+JPEG_START = b'\xff\xd8'
+JPEG_END = b'\xff\xd9'
+
+
+def write_atomic(path, data):
+    """Write `data` to `path` so readers see either the old file or the complete new one.
+
+    The bytes go to a temp file in the same directory, are flushed to disk
+    and then renamed over `path`. A power cut mid-write leaves at most a
+    stray `.part` file, never a truncated `path`.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix=PARTIAL_SUFFIX)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def remove_partials(directory):
+    """Delete temp files left behind by interrupted writes"""
+    removed = 0
+    for entry in os.scandir(directory):
+        if entry.name.endswith(PARTIAL_SUFFIX) and entry.is_file():
+            try:
+                os.remove(entry.path)
+                removed += 1
+            except OSError:
+                pass
+    return removed
+
+
+def jpeg_complete(path):
+    """Cheap JPEG check: starts with the SOI marker and ends with EOI.
+
+    Catches the truncated and empty files an interrupted write leaves,
+    reading four bytes instead of decoding the image.
+    """
+    try:
+        with open(path, 'rb') as f:
+            if f.read(2) != JPEG_START:
+                return False
+            f.seek(-2, os.SEEK_END)
+            return f.read(2) == JPEG_END
+    except OSError:
+        return False
+
+
+def jpeg_data_complete(data):
+    """`jpeg_complete` for bytes already in memory"""
+    return len(data) > 4 and data.startswith(JPEG_START) and data.endswith(JPEG_END)
+
+
+def quarantine(path):
+    """Move a corrupt cache file into `quarantine/` beside it (replacing an older copy)"""
+    directory = os.path.join(os.path.dirname(path), QUARANTINE_DIR)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        os.replace(path, os.path.join(directory, os.path.basename(path)))
+    except FileNotFoundError:
+        return
+    except OSError as e:
+        print(f"Could not quarantine {path}: {e}")
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return
+    print(f"Quarantined corrupt cache file {os.path.basename(path)}")
+
+
+def open_database(path):
+    """Connect to a SQLite cache, starting a fresh one if the file is damaged.
+
+    SQLite's journal makes its own writes crash-safe; this catches what it
+    can't (a file truncated or corrupted on disk) before the caches use it.
+    """
+    try:
+        db = sqlite3.connect(path, check_same_thread=False)
+        try:
+            if db.execute('PRAGMA quick_check').fetchone()[0] == 'ok':
+                return db
+        except sqlite3.DatabaseError:
+            pass
+        db.close()
+    except sqlite3.DatabaseError:
+        pass
+
+    quarantine(path)
+    for suffix in ('-journal', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    return sqlite3.connect(path, check_same_thread=False)
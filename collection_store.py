@@ -0,0 +1,163 @@
+"""
+Collection Store
+SQLite-backed cache of the user's collection
+"""
+import os
+import json
+import threading
+
+from cache_files import open_database
+from records import Record
+
+
+# Genres/styles are stored as one column joined with a character Discogs never uses
+TAG_SEPARATOR = '\x1f'
+
+# Column order matches Record's positional arguments
+COLUMNS = ('id', 'title', 'artist', 'year', 'thumb', 'cover', 'genres', 'styles',
+           'instance_id')
+
+
+class CollectionStore:
+    """Collection records in `<cache_dir>/collection.db`.
+
+    Records are kept in display order (newest additions first) by a
+    `position` column, so newly added records can be inserted ahead of
+    the rest without rewriting them, and any slice can be read on its own.
+    Small metadata (sync timestamps) lives in a key/value table.
+
+    Each record's date_added is kept here but not loaded into memory;
+    writers pass it alongside the records as {instance_id: date_added}.
+    """
+
+    def __init__(self, cache_dir):
+        self.db_path = os.path.join(cache_dir, 'collection.db')
+        self._lock = threading.Lock()
+
+        self._db = open_database(self.db_path)
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS records ('
+            ' position INTEGER PRIMARY KEY,'
+            ' instance_id INTEGER UNIQUE,'
+            ' id INTEGER NOT NULL,'
+            ' date_added TEXT,'
+            ' title TEXT NOT NULL,'
+            ' artist TEXT NOT NULL,'
+            ' year,'
+            ' thumb TEXT,'
+            ' cover TEXT,'
+            ' genres TEXT NOT NULL,'
+            ' styles TEXT NOT NULL)'
+        )
+        self._db.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+        self._db.commit()
+
+        self._import_legacy_json(cache_dir)
+
+    def load(self, limit=None, offset=0):
+        """Records in display order, optionally just a slice"""
+        sql = f"SELECT {', '.join(COLUMNS)} FROM records ORDER BY position"
+        params = ()
+        if limit is not None or offset:
+            # A negative limit is no limit to SQLite
+            sql += ' LIMIT ? OFFSET ?'
+            params = (-1 if limit is None else limit, offset)
+
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+
+        # Most records share a handful of genre/style combinations
+        tags = {}
+
+        def _split(joined):
+            split = tags.get(joined)
+            if split is None:
+                split = tags[joined] = tuple(joined.split(TAG_SEPARATOR)) if joined else ()
+            return split
+
+        return [
+            Record(row[0], row[1], row[2], row[3], row[4], row[5], _split(row[6]), _split(row[7]), row[8])
+            for row in rows
+        ]
+
+    def count(self):
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM records').fetchone()[0]
+
+    def get_meta(self, key):
+        with self._lock:
+            row = self._db.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, **values):
+        with self._lock:
+            self._db.executemany(
+                'INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', values.items()
+            )
+            self._db.commit()
+
+    def replace(self, records, dates_added=None):
+        """Store exactly `records`, in order"""
+        with self._lock:
+            self._db.execute('DELETE FROM records')
+            self._insert(records, 0, dates_added or {})
+            self._db.commit()
+
+    def prepend(self, records, dates_added=None):
+        """Insert `records` ahead of everything stored, keeping their order.
+
+        Records already stored (same instance id) are updated in place.
+        """
+        with self._lock:
+            first = self._db.execute('SELECT MIN(position) FROM records').fetchone()[0]
+            start = (first if first is not None else 0) - len(records)
+            self._insert(records, start, dates_added or {})
+            self._db.commit()
+
+    def _insert(self, records, start, dates_added):
+        rows = []
+        for position, record in enumerate(records, start=start):
+            rows.append((
+                position,
+                record.instance_id,
+                record.id,
+                dates_added.get(record.instance_id),
+                record.title,
+                record.artist,
+                record.year,
+                record.thumb,
+                record.cover,
+                TAG_SEPARATOR.join(record.genres),
+                TAG_SEPARATOR.join(record.styles),
+            ))
+        # Upsert on instance id so a re-sent record keeps a single row
+        self._db.executemany(
+            'INSERT INTO records (position, instance_id, id, date_added, title, artist, year,'
+            ' thumb, cover, genres, styles) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)'
+            ' ON CONFLICT(instance_id) DO UPDATE SET'
+            ' id = excluded.id, date_added = COALESCE(excluded.date_added, date_added), title = excluded.title,'
+            ' artist = excluded.artist, year = excluded.year, thumb = excluded.thumb,'
+            ' cover = excluded.cover, genres = excluded.genres, styles = excluded.styles',
+            rows
+        )
+
+    def _import_legacy_json(self, cache_dir):
+        """One-time move from the old collection.json cache"""
+        legacy_file = os.path.join(cache_dir, 'collection.json')
+        if not os.path.exists(legacy_file):
+            return
+
+        if not self.count():
+            try:
+                with open(legacy_file, 'r') as f:
+                    cache_data = json.load(f)
+                items = cache_data['items']
+                self.replace(
+                    [Record.from_dict(item) for item in items],
+                    {item.get('instance_id'): item.get('date_added') for item in items}
+                )
+                self.set_meta(timestamp=cache_data['timestamp'], full_sync=cache_data.get('full_sync'))
+                print(f"Imported {len(items)} records from collection.json")
+            except Exception as e:
+                print(f"Could not import collection.json: {e}")
+        os.remove(legacy_file)
@@ -0,0 +1,182 @@
+"""
+Cover Index
+Disk usage and access times of cached album covers, for eviction under a size budget
+"""
+import os
+import threading
+import time
+
+from cache_files import open_database
+
+
+# Background downloads stop at this share of the budget, leaving room for
+# covers the user scrolls to; eviction frees space back down to it
+BACKGROUND_FILL = 0.9
+
+# The most recently viewed covers (detail and jukebox) are never evicted
+PINNED_RECENT_VIEWS = 50
+
+# Access times are buffered in memory and written in batches of this size,
+# by a background thread
+TOUCH_BATCH = 100
+
+
+class CoverIndex:
+    """Bytes on disk per cached cover, in `<cache_dir>/covers.db`.
+
+    Eviction picks the least recently accessed covers straight from the
+    index, so the cover directory is never scanned (except once, to index
+    a cache that predates this file). Covers passed to `pin` and the most
+    recently viewed ones are kept regardless of age.
+    """
+
+    def __init__(self, cache_dir, budget_mb=512):
+        self.db_path = os.path.join(cache_dir, 'covers.db')
+        # 0 means no limit
+        self.budget = budget_mb * 1024 * 1024 if budget_mb else None
+        self._pinned = frozenset()
+        self._touched = {}   # release_id -> (accessed_at, viewed) not yet written
+        self._lock = threading.Lock()
+        # touch() runs on the UI thread; it only ever waits for this one, never
+        # for _lock, which download workers hold through SQLite writes
+        self._touched_lock = threading.Lock()
+        self._flush_wanted = threading.Event()
+
+        self._db = open_database(self.db_path)
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS covers ('
+            ' release_id INTEGER PRIMARY KEY,'
+            ' bytes INTEGER NOT NULL,'
+            ' accessed_at REAL NOT NULL,'
+            ' viewed_at REAL)'
+        )
+        self._db.execute('CREATE INDEX IF NOT EXISTS covers_accessed ON covers (accessed_at)')
+        self._db.commit()
+
+        if not self._db.execute('SELECT COUNT(*) FROM covers').fetchone()[0]:
+            self._index_existing(cache_dir)
+        self.total_bytes = self._db.execute('SELECT COALESCE(SUM(bytes), 0) FROM covers').fetchone()[0]
+
+        threading.Thread(target=self._flush_when_wanted, daemon=True, name='cover-index').start()
+
+    def add(self, release_id, size_bytes):
+        """Record a cover that was just written (original plus sizes)"""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute('SELECT bytes FROM covers WHERE release_id = ?', (release_id,)).fetchone()
+            self._db.execute(
+                'INSERT INTO covers (release_id, bytes, accessed_at) VALUES (?, ?, ?)'
+                ' ON CONFLICT(release_id) DO UPDATE SET bytes = excluded.bytes, accessed_at = excluded.accessed_at',
+                (release_id, size_bytes, now)
+            )
+            self._db.commit()
+            self.total_bytes += size_bytes - (row[0] if row else 0)
+
+    def remove(self, release_id):
+        with self._touched_lock:
+            self._touched.pop(release_id, None)
+        with self._lock:
+            row = self._db.execute('SELECT bytes FROM covers WHERE release_id = ?', (release_id,)).fetchone()
+            if row is None:
+                return
+            self._db.execute('DELETE FROM covers WHERE release_id = ?', (release_id,))
+            self._db.commit()
+            self.total_bytes -= row[0]
+
+    def touch(self, release_id, viewed=False):
+        """Note that a cover was shown; `viewed` for a detail or jukebox view"""
+        with self._touched_lock:
+            # A view stays a view if the grid shows the cover again before the flush
+            viewed = viewed or self._touched.get(release_id, (0, False))[1]
+            self._touched[release_id] = (time.time(), viewed)
+            if len(self._touched) >= TOUCH_BATCH:
+                self._flush_wanted.set()
+
+    def pin(self, release_ids):
+        """Never evict these covers (replaces the previous pins)"""
+        self._pinned = frozenset(release_ids)
+
+    def full(self):
+        """True once background downloads should stop"""
+        return self.budget is not None and self.total_bytes >= self.budget * BACKGROUND_FILL
+
+    def over_budget(self):
+        return self.budget is not None and self.total_bytes > self.budget
+
+    def evict(self):
+        """Drop least recently used covers from the index until back under budget.
+
+        Returns the evicted release ids; the caller deletes their files.
+        """
+        if not self.over_budget():
+            return []
+
+        target = self.budget * BACKGROUND_FILL
+        evicted = []
+        with self._lock:
+            self._flush()
+            keep = set(self._pinned)
+            keep.update(row[0] for row in self._db.execute(
+                'SELECT release_id FROM covers WHERE viewed_at IS NOT NULL ORDER BY viewed_at DESC LIMIT ?',
+                (PINNED_RECENT_VIEWS,)
+            ))
+
+            total = self.total_bytes
+            for release_id, size_bytes in self._db.execute(
+                'SELECT release_id, bytes FROM covers ORDER BY accessed_at'
+            ).fetchall():
+                if total <= target:
+                    break
+                if release_id in keep:
+                    continue
+                evicted.append(release_id)
+                total -= size_bytes
+
+            self._db.executemany('DELETE FROM covers WHERE release_id = ?', [(rid,) for rid in evicted])
+            self._db.commit()
+            self.total_bytes = total
+        return evicted
+
+    def flush(self):
+        """Write buffered access times"""
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        with self._touched_lock:
+            touched, self._touched = self._touched, {}
+        if not touched:
+            return
+        self._db.executemany(
+            'UPDATE covers SET accessed_at = ?, viewed_at = CASE WHEN ? THEN ? ELSE viewed_at END'
+            ' WHERE release_id = ?',
+            [(at, viewed, at, release_id) for release_id, (at, viewed) in touched.items()]
+        )
+        self._db.commit()
+
+    def _flush_when_wanted(self):
+        while True:
+            self._flush_wanted.wait()
+            self._flush_wanted.clear()
+            self.flush()
+
+    def _index_existing(self, cache_dir):
+        """One-time scan of covers cached before the index existed"""
+        covers = {}
+        for entry in os.scandir(cache_dir):
+            stem, ext = os.path.splitext(entry.name)
+            release_id = stem.split('_')[0]
+            if ext != '.jpg' or not release_id.isdigit():
+                continue
+            stat = entry.stat()
+            size_bytes, accessed_at = covers.get(int(release_id), (0, 0))
+            covers[int(release_id)] = (size_bytes + stat.st_size, max(accessed_at, stat.st_mtime))
+
+        if not covers:
+            return
+        self._db.executemany(
+            'INSERT INTO covers (release_id, bytes, accessed_at) VALUES (?, ?, ?)',
+            [(release_id, size_bytes, at) for release_id, (size_bytes, at) in covers.items()]
+        )
+        self._db.commit()
+        print(f"Indexed {len(covers)} cached covers")
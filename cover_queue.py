@@ -0,0 +1,86 @@
+"""
+Cover Queue
+Priority queue deciding which album cover is downloaded next
+"""
+import heapq
+import itertools
+import threading
+
+
+# Queue bands - anything the user is looking at beats background filling
+URGENT = 0
+BACKGROUND = 1
+
+
+class CoverQueue:
+    """Albums waiting for a cover download, with worker bookkeeping.
+
+    Background entries keep collection order. `prioritize()` puts albums
+    ahead of all of them, the most recent request first, so covers track
+    what is on screen. An album queued twice keeps its best position.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._queued = {}            # release_id -> key of its live heap entry
+        self._seq = itertools.count()
+        self._boost = 0
+        self._workers = 0
+        self._lock = threading.Lock()
+
+    def put_background(self, albums):
+        """Queue albums behind anything prioritized, in the given order"""
+        with self._lock:
+            for position, album in enumerate(albums):
+                self._push((BACKGROUND, 0, position), album)
+
+    def prioritize(self, albums):
+        """Move albums to the front, in the given order.
+
+        Returns True if no worker is running, in which case the caller
+        must start one (it is already counted by `pop`).
+        """
+        with self._lock:
+            self._boost += 1
+            for position, album in enumerate(albums):
+                self._push((URGENT, -self._boost, position), album)
+
+            start_worker = self._workers == 0 and bool(self._heap)
+            if start_worker:
+                self._workers += 1
+            return start_worker
+
+    def drop_background(self):
+        """Forget every background entry; prioritized albums stay queued"""
+        with self._lock:
+            self._queued = {release_id: key for release_id, key in self._queued.items() if key[0] != BACKGROUND}
+            self._heap = [entry for entry in self._heap if entry[0][0] != BACKGROUND]
+            heapq.heapify(self._heap)
+
+    def add_worker(self):
+        """Register a worker that will call `pop` until it returns None"""
+        with self._lock:
+            self._workers += 1
+
+    def pop(self):
+        """Next album to fetch, or None when empty (the worker should exit)"""
+        with self._lock:
+            while self._heap:
+                key, _, album = heapq.heappop(self._heap)
+                if self._queued.get(album['id']) != key:
+                    continue  # superseded by a better-placed entry
+                del self._queued[album['id']]
+                return album
+
+            self._workers -= 1
+            return None
+
+    def __len__(self):
+        return len(self._queued)
+
+    def _push(self, key, album):
+        current = self._queued.get(album['id'])
+        if current is not None and current <= key:
+            return
+        self._queued[album['id']] = key
+        heapq.heappush(self._heap, (key, next(self._seq), album))
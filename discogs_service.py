@@ -3,29 +3,157 @@ Discogs API Service
 Handles all interactions with the Discogs API
 """
 import discogs_client
+from discogs_client.fetchers import Fetcher
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from io import BytesIO
 from PIL import Image
 import random
-import json
 from datetime import datetime, timedelta
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from cache_files import jpeg_complete, jpeg_data_complete, quarantine, remove_partials, write_atomic
+from collection_store import CollectionStore
+from cover_index import CoverIndex
+from cover_queue import CoverQueue
+from genre_index import GenreIndex
+from metrics import metrics
+from rate_limiter import RateLimiter
+from records import Record
+from release_cache import ReleaseCache
+from search_index import SearchIndex
+
+
+USER_AGENT = 'VinylCollectionApp/1.0'
+API_URL = 'https://api.discogs.com'
+
+# Derived cover sizes (longest edge in px), generated once at download time
+COVER_SIZES = {
+    'grid': 200,    # AlbumCard in the collection and search grids
+    'large': 320,   # Detail and jukebox views
+}
+
+# Downloaded originals larger than this (longest edge in px) are scaled down
+MAX_ORIGINAL_EDGE = 1200
+
+
+def create_session(api_url=API_URL, api_pool_size=4, image_pool_size=8):
+    """Build a keep-alive HTTP session shared by all Discogs traffic.
+
+    Connections are pooled per host so TLS handshakes are paid once per
+    worker rather than once per request. Transient 5xx errors are retried
+    by the adapter; 429s are left to the RateLimiter.
+    """
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset(['GET', 'HEAD']),
+    )
+    
+    session = requests.Session()
+    session.headers.update({
+        'User-Agent': USER_AGENT,
+        'Accept-Encoding': 'gzip, deflate',
+    })
+    session.mount(api_url, HTTPAdapter(
+        pool_connections=1, pool_maxsize=api_pool_size, max_retries=retry
+    ))
+    session.mount('https://i.discogs.com', HTTPAdapter(
+        pool_connections=1, pool_maxsize=image_pool_size, max_retries=retry
+    ))
+    session.mount('https://', HTTPAdapter(max_retries=retry))
+    return session
+
+
+class SessionFetcher(Fetcher):
+    """discogs_client fetcher that reuses the service's pooled session and API rate limit"""
+    
+    def __init__(self, session, user_token, limiter):
+        self.session = session
+        self.user_token = user_token
+        self.limiter = limiter
+    
+    def fetch(self, client, method, url, data=None, headers=None, json=True, **kwargs):
+        headers = dict(headers or {})
+        headers['Authorization'] = f'Discogs token={self.user_token}'
+
+        # discogs_client's own fetcher retries 429s; the limiter pauses
+        # until Discogs has room again, so keep trying for a while
+        give_up = time.monotonic() + 5 * self.limiter.window
+        while True:
+            self.limiter.acquire()
+            started = time.perf_counter()
+            response = self.session.request(method, url, data=data, headers=headers, timeout=30)
+            metrics.record_response('api', response, started)
+            self.limiter.observe(response)
+            if response.status_code != 429 or time.monotonic() > give_up:
+                break
+            print(f"Rate limited, backing off ({url})")
+        return response.content, response.status_code
 
 
 class DiscogsService:
-    def __init__(self, user_token, username, cache_dir='./cache'):
-        self.client = discogs_client.Client('VinylCollectionApp/1.0', user_token=user_token)
+    def __init__(self, user_token, username, cache_dir='./cache',
+                 release_cache_ttl_hours=720, release_cache_max_entries=5000,
+                 cover_cache_mb=512, api_url=API_URL):
+        # api_url can point at a local stand-in (mock_discogs.py) for testing
+        self.api_url = api_url.rstrip('/')
+        self.session = create_session(self.api_url)
+        # Discogs allows 60 authenticated API requests per moving minute;
+        # the burst lets a cold collection load fan out immediately, and the
+        # limiter waits for the window to clear once the headers run low
+        self.api_limiter = RateLimiter(rate=1.0, burst=50, low_water=5)
+        self.client = discogs_client.Client(USER_AGENT, user_token=user_token)
+        self.client._base_url = self.api_url
+        self.client._fetcher = SessionFetcher(self.session, user_token, self.api_limiter)
         self.user_token = user_token
         self.username = username
         self.cache_dir = cache_dir
         self.user = None
+        # Set when Discogs rejects the token or username - retrying won't help
+        self.credentials_error = None
         self.collection = []
+        # True once `self.collection` holds the cached collection
+        self._collection_from_cache = False
+        # {instance_id: date_added} of records fetched but not stored yet
+        self._dates_added = {}
+        # Optional callback(release_id), called from download threads when a new cover is saved
+        self.on_cover_downloaded = None
+        self.search_index = SearchIndex()
+        self.genre_index = GenreIndex()
+        
+        # Worker pool for network calls that must not block the UI thread
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='discogs')
+        
+        # Shared by every cover download worker
+        self.cover_limiter = RateLimiter(rate=5.0, burst=5)
+        self.cover_queue = CoverQueue()
+        self._cover_progress = None
+        # Cover files already checked for truncation this run
+        self._verified_covers = set()
         
         # Create cache directory if it doesn't exist
         if not os.path.exists(cache_dir):
             os.makedirs(cache_dir)
+        
+        # Leftovers from writes cut short by a crash or power loss - swept
+        # now, before any download worker starts writing its own
+        removed = remove_partials(cache_dir)
+        if removed:
+            print(f"Removed {removed} partial cover files")
+        
+        self.collection_store = CollectionStore(cache_dir)
+        self.cover_index = CoverIndex(cache_dir, budget_mb=cover_cache_mb)
+        self.release_cache = ReleaseCache(
+            cache_dir,
+            ttl_hours=release_cache_ttl_hours,
+            max_entries=release_cache_max_entries
+        )
     
     def authenticate(self):
         """Authenticate and get user info"""
@@ -34,96 +162,131 @@ class DiscogsService:
             return True
         except Exception as e:
             print(f"Authentication error: {e}")
+            if getattr(e, 'status_code', None) in (401, 403):
+                self.credentials_error = 'Discogs rejected the user token'
             return False
     
-    def get_collection(self, page=1, per_page=100, max_items=None, force_refresh=False):
-        """Fetch user's vinyl collection (with caching)"""
-        cache_file = os.path.join(self.cache_dir, 'collection.json')
+    def load_cached_collection(self, on_page=None, first_page=48):
+        """Load the cached collection without touching the network.
+
+        Lets the UI show records straight away, before authenticating or
+        refreshing; `get_collection` then reuses what was loaded here.
+        With `on_page`, the first `first_page` records are read and
+        published on their own (`on_page(page_items, total_items)`, from
+        this thread) before the rest is appended.
+        """
+        try:
+            with metrics.timer('collection.load_cached_first' if on_page else 'collection.load_cached'):
+                items = self.collection_store.load(limit=first_page if on_page else None)
+        except Exception as e:
+            print(f"Cache read error: {e}")
+            return []
+        
+        if not items:
+            return self.collection
+        
+        self.set_collection(items)
+        self._collection_from_cache = True
+        if on_page and len(items) == first_page:
+            on_page(items, self.collection_store.count())
+            try:
+                with metrics.timer('collection.load_cached'):
+                    rest = self.collection_store.load(offset=first_page)
+            except Exception as e:
+                # Only part of the cache is loaded - get_collection reads it again
+                print(f"Cache read error: {e}")
+                self._collection_from_cache = False
+                return self.collection
+            self.extend_collection(rest)
+        
+        print(f"Loaded {len(self.collection)} records from cache")
+        return self.collection
+    
+    def get_collection(self, page=1, per_page=100, max_items=None, force_refresh=False, on_page=None):
+        """Fetch user's vinyl collection (with caching).
+
+        A fresh cache is used as-is. Once it expires, only records added
+        since the last sync are fetched and inserted into the cache; a full
+        refetch happens when that can't account for the collection (e.g.
+        removals), every `full_sync_days`, or when `force_refresh` is set.
+
+        If nothing is loaded yet, a full fetch publishes records as each
+        page lands: they are appended to `self.collection` and
+        `on_page(page_items, total_items)` is called from this thread.
+
+        Returns None if the collection couldn't be fetched.
+        """
         cache_age_hours = 24  # Refresh cache after 24 hours
+        full_sync_days = 7    # Full reconciliation (catches edits) after 7 days
+        cached_items = None
+        full_sync = None
         
         # Try to load from cache first
-        if not force_refresh and os.path.exists(cache_file):
+        if not force_refresh:
             try:
-                with open(cache_file, 'r') as f:
-                    cache_data = json.load(f)
-                    cache_time = datetime.fromisoformat(cache_data['timestamp'])
-                    age = datetime.now() - cache_time
+                timestamp = self.collection_store.get_meta('timestamp')
+                if timestamp:
+                    if self._collection_from_cache:
+                        cached_items = self.collection
+                    else:
+                        cached_items = self.collection_store.load()
+                    full_sync = self.collection_store.get_meta('full_sync')
+                    age = datetime.now() - datetime.fromisoformat(timestamp)
                     
                     if age < timedelta(hours=cache_age_hours):
-                        print(f"Loading collection from cache ({len(cache_data['items'])} records)")
-                        self.collection = cache_data['items']
+                        print(f"Loading collection from cache ({len(cached_items)} records)")
+                        if not self._collection_from_cache:
+                            self.set_collection(cached_items)
                         return self.collection
                     else:
-                        print(f"Cache is {age.seconds//3600}h old, refreshing...")
+                        print(f"Cache is {int(age.total_seconds() // 3600)}h old, refreshing...")
             except Exception as e:
                 print(f"Cache read error: {e}, fetching fresh data...")
+                cached_items = None
         
-        # Fetch from API using direct requests (faster than iterating)
         try:
             if not self.user:
                 self.authenticate()
             
-            print("Fetching collection from Discogs API...")
-            items = []
-            page = 1
-            total_pages = None
+            new_items = None
+            if cached_items is not None and full_sync and not max_items:
+                if datetime.now() - datetime.fromisoformat(full_sync) < timedelta(days=full_sync_days):
+                    new_items = self._sync_collection(cached_items, per_page)
             
-            while True:
-                # Use direct API call for pagination
-                url = f"https://api.discogs.com/users/{self.username}/collection/folders/0/releases"
-                params = {
-                    'page': page,
-                    'per_page': per_page,
-                    'token': self.user_token
-                }
-                
-                response = requests.get(url, params=params, timeout=30)
-                if response.status_code != 200:
-                    print(f"API error: {response.status_code}")
-                    break
-                
-                data = response.json()
-                
-                if total_pages is None:
-                    total_pages = data['pagination']['pages']
-                    total_items = data['pagination']['items']
-                    print(f"Fetching {total_items} records across {total_pages} pages...")
-                
-                # Process releases from this page
-                for item in data['releases']:
-                    basic_info = item['basic_information']
-                    items.append({
-                        'id': basic_info['id'],
-                        'title': basic_info['title'],
-                        'artist': basic_info['artists'][0]['name'] if basic_info.get('artists') else 'Unknown',
-                        'year': basic_info.get('year', 'N/A'),
-                        'thumb': basic_info.get('thumb', None),
-                        'cover': basic_info['cover_image'] if basic_info.get('cover_image') else None,
-                        'genres': basic_info.get('genres', []),
-                        'styles': basic_info.get('styles', []),
-                    })
-                
-                print(f"Loaded page {page}/{total_pages} ({len(items)} records so far)")
-                
-                if max_items and len(items) >= max_items:
-                    print(f"Reached limit of {max_items} records")
-                    break
-                
-                if page >= total_pages:
-                    break
+            indexed = False
+            if new_items is not None:
+                if cached_items is self.collection:
+                    # Already on screen and indexed - add only what's new
+                    indexed = True
+                    if new_items:
+                        self.prepend_collection(new_items)
+                    items = self.collection
+                else:
+                    items = new_items + cached_items
+            else:
+                publish = None
+                if on_page and not self.collection:
+                    # Nothing to show yet - let screens fill in page by page
+                    indexed = True
+                    def publish(page_items, total_items):
+                        self.extend_collection(page_items)
+                        on_page(page_items, total_items)
                 
-                page += 1
+                items = self._fetch_collection(per_page, max_items, on_page=publish)
+                if items is None:
+                    return None
+                full_sync = datetime.now().isoformat()
             
-            self.collection = items
+            if not indexed:
+                self.set_collection(items)
             
-            # Save to cache
+            # Save to cache - only the new records after an incremental sync
             try:
-                cache_data = {
-                    'timestamp': datetime.now().isoformat(),
-                    'items': items
-                }
-                with open(cache_file, 'w') as f:
-                    json.dump(cache_data, f)
+                if new_items is not None:
+                    self.collection_store.prepend(new_items, self._dates_added)
+                else:
+                    self.collection_store.replace(items, self._dates_added)
+                self.collection_store.set_meta(timestamp=datetime.now().isoformat(), full_sync=full_sync)
                 print(f"Collection cached ({len(items)} records)")
             except Exception as e:
                 print(f"Cache write error: {e}")
@@ -131,10 +294,167 @@ class DiscogsService:
             return items
         except Exception as e:
             print(f"Error fetching collection: {e}")
-            return []
+            return None
+        finally:
+            self._dates_added = {}
+    
+    def _fetch_collection_page(self, page, per_page, sort='added', sort_order='desc'):
+        """Fetch one page of the collection, newest additions first; None on error"""
+        url = f"{self.api_url}/users/{self.username}/collection/folders/0/releases"
+        params = {
+            'page': page,
+            'per_page': per_page,
+            'sort': sort,
+            'sort_order': sort_order,
+            'token': self.user_token
+        }
+        
+        # A 429 pauses the limiter until the moving window has room, so keep
+        # retrying - a missing page costs the whole fetch
+        give_up = time.monotonic() + 5 * self.api_limiter.window
+        while True:
+            self.api_limiter.acquire()
+            started = time.perf_counter()
+            response = self.session.get(url, params=params, timeout=30)
+            metrics.record_response('api', response, started)
+            self.api_limiter.observe(response)
+            if response.status_code == 200:
+                return response.json()
+            if response.status_code in (401, 403, 404):
+                # Bad token, or a username that doesn't exist or keeps its collection private
+                self.credentials_error = (
+                    'Discogs rejected the user token' if response.status_code == 401
+                    else f"Discogs won't list {self.username}'s collection"
+                )
+                break
+            if response.status_code != 429 or time.monotonic() > give_up:
+                break
+            print(f"Rate limited, backing off (collection page {page})")
+        
+        print(f"API error: {response.status_code}")
+        return None
+    
+    def _parse_collection_item(self, item):
+        """Flatten a collection API entry into the Record used by the app"""
+        basic_info = item['basic_information']
+        # Only collection.db keeps date_added - held here until it is stored
+        self._dates_added[item.get('instance_id')] = item.get('date_added')
+        return Record(
+            id=basic_info['id'],
+            instance_id=item.get('instance_id'),
+            title=basic_info['title'],
+            artist=basic_info['artists'][0]['name'] if basic_info.get('artists') else 'Unknown',
+            year=basic_info.get('year', 'N/A'),
+            thumb=basic_info.get('thumb', None),
+            cover=basic_info['cover_image'] if basic_info.get('cover_image') else None,
+            genres=basic_info.get('genres', []),
+            styles=basic_info.get('styles', []),
+        )
+    
+    def _fetch_collection(self, per_page, max_items=None, workers=4, on_page=None):
+        """Fetch every page of the collection; None if any page fails.
+
+        Page 1 reveals the page count, then the remaining pages are fetched
+        concurrently under the shared API rate limit and assembled in order.
+        `on_page(page_items, total_items)` is called for each page, in order,
+        so records published before a failed page stay on screen but are
+        never cached as the full collection.
+        """
+        print("Fetching collection from Discogs API...")
+        data = self._fetch_collection_page(1, per_page)
+        if data is None:
+            return None
+        
+        total_pages = data['pagination']['pages']
+        total_items = data['pagination']['items']
+        print(f"Fetching {total_items} records across {total_pages} pages...")
+        
+        if max_items:
+            total_pages = min(total_pages, (max_items + per_page - 1) // per_page)
+            total_items = min(total_items, max_items)
+        
+        items = []
+        
+        def _add_page(page, data):
+            page_items = [self._parse_collection_item(item) for item in data['releases']]
+            if max_items:
+                page_items = page_items[:max_items - len(items)]
+            items.extend(page_items)
+            print(f"Loaded page {page}/{total_pages} ({len(items)} records so far)")
+            if on_page:
+                on_page(page_items, total_items)
+        
+        _add_page(1, data)
+        
+        if total_pages > 1:
+            pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='collection')
+            futures = [pool.submit(self._fetch_collection_page, page, per_page)
+                       for page in range(2, total_pages + 1)]
+            try:
+                for page, future in enumerate(futures, start=2):
+                    data = future.result()
+                    if data is None:
+                        print(f"Stopping at page {page}/{total_pages}, collection not cached")
+                        return None
+                    _add_page(page, data)
+            finally:
+                # Don't fetch pages that would be thrown away, or wait for
+                # ones still retrying 429s
+                pool.shutdown(wait=False, cancel_futures=True)
+        
+        if max_items and len(items) >= max_items:
+            print(f"Reached limit of {max_items} records")
+        
+        return items
+    
+    def _sync_collection(self, known_items, per_page):
+        """Records added since the last sync, newest first.
+
+        Walks pages newest-first and stops at the first known instance.
+        Returns None when a full fetch is needed instead: the API failed,
+        or the known + new counts don't add up to the collection total
+        (records were removed).
+        """
+        known = {item.get('instance_id') for item in known_items}
+        if None in known:
+            # Cached before instance ids were stored
+            return None
+        
+        print("Syncing new additions from Discogs API...")
+        new_items = []
+        page = 1
+        
+        while True:
+            data = self._fetch_collection_page(page, per_page)
+            if data is None:
+                return None
+            
+            reached_known = False
+            for item in data['releases']:
+                if item.get('instance_id') in known:
+                    reached_known = True
+                    break
+                new_items.append(self._parse_collection_item(item))
+            
+            if reached_known or page >= data['pagination']['pages']:
+                break
+            page += 1
+        
+        total_items = data['pagination']['items']
+        if len(known_items) + len(new_items) != total_items:
+            print("Collection changed beyond new additions, running full sync...")
+            return None
+        
+        print(f"Synced {len(new_items)} new records in {page} request(s)")
+        return new_items
     
     def get_release_details(self, release_id):
-        """Get detailed information about a specific release"""
+        """Get detailed information about a specific release (with caching)"""
+        cached = self.release_cache.get(release_id)
+        metrics.hit('release_cache', cached is not None)
+        if cached is not None:
+            return cached
+        
         try:
             release = self.client.release(release_id)
             
@@ -147,7 +467,7 @@ class DiscogsService:
                         'duration': track.duration
                     })
             
-            return {
+            details = {
                 'id': release.id,
                 'title': release.title,
                 'artist': release.artists[0].name if release.artists else 'Unknown',
@@ -160,47 +480,72 @@ class DiscogsService:
                 'country': release.country if hasattr(release, 'country') else 'Unknown',
                 'notes': release.notes if hasattr(release, 'notes') else '',
             }
+            self.release_cache.put(release_id, details)
+            return details
         except Exception as e:
             print(f"Error fetching release details: {e}")
-            return None
+            # Offline or API error - an expired entry beats nothing
+            return self.release_cache.get(release_id, allow_stale=True)
     
-    def search_collection(self, query):
-        """Search within user's collection"""
-        query_lower = query.lower()
-        results = []
+    def get_release_details_async(self, release_id, callback=None):
+        """Fetch release details on a worker thread.
+
+        Returns a Future resolving to the details dict (or None on error).
+        If given, `callback(release_id, details)` is called from the worker
+        thread once the fetch finishes - marshal to the UI thread yourself.
+        """
+        future = self._executor.submit(self.get_release_details, release_id)
         
-        for item in self.collection:
-            if (query_lower in item['title'].lower() or 
-                query_lower in item['artist'].lower() or
-                any(query_lower in genre.lower() for genre in item['genres'])):
-                results.append(item)
+        if callback:
+            def _done(f):
+                try:
+                    details = f.result()
+                except Exception as e:
+                    print(f"Error fetching release details: {e}")
+                    details = None
+                callback(release_id, details)
+            future.add_done_callback(_done)
         
-        return results
+        return future
+    
+    def set_collection(self, items):
+        """Replace the in-memory collection and rebuild lookup indexes.
+
+        Indexes are built aside and swapped in, so screens keep working
+        against the previous collection while a refresh is indexed.
+        """
+        search_index = SearchIndex(items)
+        genre_index = GenreIndex(items)
+        self.search_index, self.genre_index = search_index, genre_index
+        self.collection = items
+    
+    def extend_collection(self, items):
+        """Append records to the in-memory collection and its indexes"""
+        self.search_index.add_items(items)
+        self.genre_index.add_items(items)
+        self.collection.extend(items)
+    
+    def prepend_collection(self, items):
+        """Put newly added records ahead of the in-memory collection, indexing only them"""
+        self.search_index.add_items(items, front=True)
+        self.genre_index.add_items(items)
+        self.collection = items + self.collection
+    
+    def search_collection(self, query, limit=None, offset=0):
+        """Search within user's collection (title, artist, genre and style prefixes)"""
+        with metrics.timer('search.query'):
+            return self.search_index.search(query, limit=limit, offset=offset)
+    
+    def count_search_results(self, query):
+        """Number of records search_collection would return for `query`"""
+        return self.search_index.count(query)
     
     def get_random_by_mood(self, mood=None):
         """Get random albums based on mood/genre"""
-        # Mood to genre/style mapping
-        mood_map = {
-            'energetic': ['Rock', 'Punk', 'Electronic', 'Dance', 'Hip Hop'],
-            'chill': ['Jazz', 'Ambient', 'Classical', 'Folk', 'Soul'],
-            'melancholic': ['Blues', 'Folk', 'Classical', 'Indie'],
-            'happy': ['Pop', 'Funk', 'Soul', 'Disco'],
-            'dark': ['Metal', 'Industrial', 'Gothic', 'Post-Punk'],
-            'groovy': ['Funk', 'Soul', 'Disco', 'R&B'],
-        }
-        
-        if mood and mood.lower() in mood_map:
-            # Filter by mood
-            matching = []
-            target_genres = mood_map[mood.lower()]
-            
-            for item in self.collection:
-                item_genres = item['genres'] + item['styles']
-                if any(genre in target_genres for genre in item_genres):
-                    matching.append(item)
-            
-            if matching:
-                return random.choice(matching)
+        if mood:
+            album = self.genre_index.random_by_mood(mood)
+            if album:
+                return album
         
         # Random from entire collection
         if self.collection:
@@ -210,52 +555,160 @@ class DiscogsService:
     
     def get_random_by_genre(self, genre):
         """Get random album by specific genre"""
-        matching = []
-        genre_lower = genre.lower()
-        
-        for item in self.collection:
-            item_genres = [g.lower() for g in (item['genres'] + item['styles'])]
-            if genre_lower in item_genres:
-                matching.append(item)
+        return self.genre_index.random_by_genre(genre)
+    
+    def get_all_genres(self):
+        """Get all unique genres and styles, most common first"""
+        return self.genre_index.genres()
+    
+    def cover_file(self, release_id, size=None):
+        """Cache path for a cover at `size` (a COVER_SIZES key) or the original"""
+        suffix = f"_{size}" if size else ""
+        return os.path.join(self.cache_dir, f"{release_id}{suffix}.jpg")
+    
+    def cover_path(self, release_id, size=None):
+        """Best cached cover for `size`, falling back to the original; None if not cached"""
+        for path in (self.cover_file(release_id, size) if size else None, self.cover_file(release_id)):
+            if path and self._cover_ok(path):
+                # Detail and jukebox views are the ones asking for the large size
+                self.cover_index.touch(release_id, viewed=size == 'large')
+                return path
+        return None
+    
+    def has_cover_sizes(self, release_id):
+        """True when every derived cover size is cached"""
+        return all(self._cover_ok(self.cover_file(release_id, size)) for size in COVER_SIZES)
+    
+    def _cover_ok(self, path):
+        """True if `path` holds a complete cover; corrupt files are quarantined.
+
+        Each file is checked once per run - everything written since goes
+        through `write_atomic` and can't be truncated.
+        """
+        if path in self._verified_covers:
+            return True
+        if not os.path.exists(path):
+            return False
+        if not jpeg_complete(path):
+            quarantine(path)
+            return False
+        self._verified_covers.add(path)
+        return True
+    
+    def quarantine_cover(self, release_id):
+        """Set aside a cover that failed to decode and download it again"""
+        for size in (None, *COVER_SIZES):
+            path = self.cover_file(release_id, size)
+            self._verified_covers.discard(path)
+            quarantine(path)
+        self.cover_index.remove(release_id)
         
-        if matching:
-            return random.choice(matching)
+        album = next((album for album in self.collection if album['id'] == release_id), None)
+        if album is not None:
+            self.prioritize_covers([album])
+    
+    def _cover_stored(self, release_id):
+        """Account for a newly written cover, evicting old ones if over budget"""
+        size_bytes = 0
+        for size in (None, *COVER_SIZES):
+            try:
+                size_bytes += os.path.getsize(self.cover_file(release_id, size))
+            except OSError:
+                pass
+        self.cover_index.add(release_id, size_bytes)
         
-        return None
+        evicted = self.cover_index.evict()
+        for evicted_id in evicted:
+            for size in (None, *COVER_SIZES):
+                path = self.cover_file(evicted_id, size)
+                self._verified_covers.discard(path)
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+        if evicted:
+            print(f"Cover cache over budget, evicted {len(evicted)} covers")
     
-    def get_all_genres(self):
-        """Get all unique genres from collection"""
-        genres = set()
-        for item in self.collection:
-            genres.update(item['genres'])
-            genres.update(item['styles'])
-        return sorted(list(genres))
+    def _save_cover(self, path, data):
+        write_atomic(path, data)
+        self._verified_covers.add(path)
+    
+    def _save_cover_sizes(self, source, release_id):
+        """Generate every COVER_SIZES variant from an image file or buffer"""
+        with metrics.timer('cover.resize'):
+            img = Image.open(source)
+            # Let the JPEG decoder downscale while decoding - far cheaper than a full decode
+            largest = max(COVER_SIZES.values())
+            img.draft('RGB', (largest, largest))
+            img = img.convert('RGB')
+            
+            # Largest first so each step shrinks the previous result in place
+            for size, edge in sorted(COVER_SIZES.items(), key=lambda item: -item[1]):
+                img.thumbnail((edge, edge))
+                buffer = BytesIO()
+                img.save(buffer, 'JPEG', quality=85)
+                self._save_cover(self.cover_file(release_id, size), buffer.getvalue())
+    
+    def _original_cover_data(self, content):
+        """Bytes to cache as the original cover for downloaded `content`.
+
+        A complete JPEG within MAX_ORIGINAL_EDGE is kept byte for byte -
+        Image.open only parses the header, so nothing is decoded here.
+        Anything else (PNG, GIF, oversized) is transcoded to JPEG.
+        """
+        img = Image.open(BytesIO(content))
+        if img.format == 'JPEG' and max(img.size) <= MAX_ORIGINAL_EDGE and jpeg_data_complete(content):
+            return content
+        
+        img.draft('RGB', (MAX_ORIGINAL_EDGE, MAX_ORIGINAL_EDGE))
+        img = img.convert('RGB')
+        img.thumbnail((MAX_ORIGINAL_EDGE, MAX_ORIGINAL_EDGE))
+        buffer = BytesIO()
+        img.save(buffer, 'JPEG', quality=90)
+        return buffer.getvalue()
     
     def download_cover(self, url, release_id):
-        """Download and cache album cover"""
+        """Download and cache album cover (original plus derived sizes)"""
         if not url:
             return None
         
-        cache_path = os.path.join(self.cache_dir, f"{release_id}.jpg")
+        cache_path = self.cover_file(release_id)
         
-        # Return cached version if exists
-        if os.path.exists(cache_path):
-            return cache_path
+        # Return cached version if exists, backfilling sizes from older caches
+        cached = self._cover_ok(cache_path)
+        metrics.hit('cover_files', cached)
+        if cached:
+            if self.has_cover_sizes(release_id):
+                return cache_path
+            try:
+                self._save_cover_sizes(cache_path, release_id)
+                self._cover_stored(release_id)
+                return cache_path
+            except Exception as e:
+                # Complete on disk but undecodable - fetch it again
+                print(f"Error resizing cover {release_id}: {e}")
+                self._verified_covers.discard(cache_path)
+                quarantine(cache_path)
         
-        # Download cover with retry and rate limiting
+        # Download cover with retry; pacing comes from the shared limiter
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                time.sleep(0.2)  # Rate limit: 5 per second max
-                response = requests.get(url, timeout=10)
+                self.cover_limiter.acquire()
+                started = time.perf_counter()
+                response = self.session.get(url, timeout=10)
+                metrics.record_response('cover', response, started)
+                self.cover_limiter.observe(response)
                 if response.status_code == 200:
-                    img = Image.open(BytesIO(response.content))
-                    img.save(cache_path, 'JPEG')
+                    with metrics.timer('cover.save'):
+                        self._save_cover(cache_path, self._original_cover_data(response.content))
+                    self._save_cover_sizes(BytesIO(response.content), release_id)
+                    self._cover_stored(release_id)
+                    if self.on_cover_downloaded:
+                        self.on_cover_downloaded(release_id)
                     return cache_path
                 elif response.status_code == 429:
-                    wait_time = (attempt + 1) * 2
-                    print(f"Rate limited, waiting {wait_time}s...")
-                    time.sleep(wait_time)
+                    print(f"Rate limited, backing off (cover {release_id})")
                 else:
                     break
             except Exception as e:
@@ -264,60 +717,114 @@ class DiscogsService:
         
         return None
     
-    def download_all_covers(self, progress_callback=None, prewarm_count=20):
+    def prioritize_covers(self, albums):
+        """Download these albums' covers next (visible page, search results, picks)"""
+        if self.cover_queue.prioritize(albums):
+            threading.Thread(target=self._cover_worker, daemon=True, name='covers').start()
+    
+    def _cover_worker(self):
+        """Download queued covers until the queue is empty"""
+        while True:
+            album = self.cover_queue.pop()
+            if album is None:
+                return
+            
+            url = album.get('cover') or album.get('thumb')
+            # Covers cached before derived sizes existed only need resizing
+            cached = self._cover_ok(self.cover_file(album['id']))
+            result = self.download_cover(url, album['id'])
+            
+            progress = self._cover_progress
+            if progress:
+                progress(album, cached, result)
+    
+    def download_all_covers(self, progress_callback=None, prewarm_count=20, workers=4):
         """Download all album covers in background with rate limiting.
 
-        - Pre-warm the first `prewarm_count` covers synchronously (fast startup UX)
-        - Continue downloading the rest in order
-        - Calls `progress_callback(current, total, downloaded, skipped)` periodically
+        - Covers are fetched by `workers` threads sharing one rate limiter
+        - Collection order is kept, except that covers passed to
+          `prioritize_covers` jump the queue
+        - Calls `progress_callback(current, total, downloaded, skipped)` for the
+          first `prewarm_count` covers, then every 10
+        - The first `prewarm_count` covers are pinned in the cover cache, and
+          the run stops early once the cache nears its disk budget
         """
         total = len(self.collection)
-        downloaded = 0
-        skipped = 0
+        state = {'current': 0, 'downloaded': 0, 'skipped': 0}
+        lock = threading.Lock()
 
         # Helper to report progress safely
         def _report(cur):
             if progress_callback:
                 try:
-                    progress_callback(cur, total, downloaded, skipped)
+                    progress_callback(cur, total, state['downloaded'], state['skipped'])
                 except Exception:
                     pass
 
-        # Pre-warm first N covers (attempt up to prewarm_count)
-        prewarm_count = min(prewarm_count, total)
-        for i in range(prewarm_count):
-            album = self.collection[i]
-            url = album.get('cover') or album.get('thumb')
-            release_id = album['id']
-            cache_path = os.path.join(self.cache_dir, f"{release_id}.jpg")
-            if os.path.exists(cache_path):
-                skipped += 1
-            else:
-                result = self.download_cover(url, release_id)
-                if result:
-                    downloaded += 1
-            _report(i + 1)
-
-        # Background - remaining covers
-        for i in range(prewarm_count, total):
-            album = self.collection[i]
-            url = album.get('cover') or album.get('thumb')
-            release_id = album['id']
+        def _finished(result):
+            with lock:
+                state['current'] += 1
+                if result == 'downloaded':
+                    state['downloaded'] += 1
+                elif result == 'skipped':
+                    state['skipped'] += 1
+                cur = state['current']
+                # Report every prewarm cover, then every 10 items to avoid UI spam
+                if cur <= prewarm_count or cur % 10 == 0:
+                    _report(cur)
 
-            cache_path = os.path.join(self.cache_dir, f"{release_id}.jpg")
-            if os.path.exists(cache_path):
-                skipped += 1
+        # The first page of the collection is what everyone sees first
+        first_page = {album['id'] for album in self.collection[:prewarm_count]}
+        self.cover_index.pin(first_page)
+        
+        # Fully cached covers are counted without touching the queue
+        pending = []
+        for album in self.collection:
+            if self.has_cover_sizes(album['id']):
+                _finished('skipped')
             else:
-                result = self.download_cover(url, release_id)
-                if result:
-                    downloaded += 1
-
-            # Report every 10 items to avoid UI spam
-            if (i + 1) % 10 == 0:
-                _report(i + 1)
+                pending.append(album)
+        
+        if self.cover_index.full():
+            print("Cover cache is full, only fetching first page covers")
+            pending = [album for album in pending if album['id'] in first_page]
+        
+        pending_ids = {album['id'] for album in pending}
+        
+        def _progress(album, cached, result):
+            # Prioritized covers outside this run aren't part of its count
+            with lock:
+                if album['id'] not in pending_ids:
+                    return
+                pending_ids.discard(album['id'])
+            if cached:
+                _finished('skipped')
+            else:
+                _finished('downloaded' if result else None)
+            
+            # Leave the rest of the budget to covers the user scrolls to
+            if result and not state.get('full') and self.cover_index.full():
+                state['full'] = True
+                print("Cover cache is full, stopping background cover download")
+                self.cover_queue.drop_background()
+        
+        self._cover_progress = _progress
+        self.cover_queue.put_background(pending)
+        
+        threads = []
+        for _ in range(workers):
+            self.cover_queue.add_worker()
+            thread = threading.Thread(target=self._cover_worker, daemon=True, name='covers')
+            thread.start()
+            threads.append(thread)
+        for thread in threads:
+            thread.join()
+        
+        self._cover_progress = None
 
         # Final report
         _report(total)
 
+        downloaded, skipped = state['downloaded'], state['skipped']
         print(f"✓ Cover download complete: {downloaded} new, {skipped} cached")
         return downloaded, skipped
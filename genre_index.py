@@ -0,0 +1,76 @@
+"""
+Genre Index
+Genre/style and mood lookups for Jukebox picks, built once per collection
+"""
+import random
+import threading
+from collections import Counter
+
+
+# Mood to genre/style mapping
+MOOD_MAP = {
+    'energetic': ['Rock', 'Punk', 'Electronic', 'Dance', 'Hip Hop'],
+    'chill': ['Jazz', 'Ambient', 'Classical', 'Folk', 'Soul'],
+    'melancholic': ['Blues', 'Folk', 'Classical', 'Indie'],
+    'happy': ['Pop', 'Funk', 'Soul', 'Disco'],
+    'dark': ['Metal', 'Industrial', 'Gothic', 'Post-Punk'],
+    'groovy': ['Funk', 'Soul', 'Disco', 'R&B'],
+}
+
+
+class GenreIndex:
+    """Genre/style -> records and mood -> records, kept as lists for O(1) random picks"""
+
+    def __init__(self, items=None):
+        # The collection may be indexed on a loader thread while the UI picks
+        self._lock = threading.RLock()
+        self.build(items or [])
+
+    def build(self, items):
+        """Index `items` from scratch"""
+        with self._lock:
+            self._by_genre = {}         # lowercased genre or style -> [items]
+            self._by_mood = {mood: [] for mood in MOOD_MAP}
+            self._counts = Counter()    # genre or style (original case) -> records
+            self._sorted_genres = None
+            self._mood_lookup = {}
+            for mood, genres in MOOD_MAP.items():
+                for genre in genres:
+                    self._mood_lookup.setdefault(genre, []).append(mood)
+            self.add_items(items)
+
+    def add_items(self, items):
+        """Index additional records without rebuilding"""
+        with self._lock:
+            for item in items:
+                tags = set(item['genres']) | set(item['styles'])
+                moods = set()
+                for tag in tags:
+                    self._counts[tag] += 1
+                    moods.update(self._mood_lookup.get(tag, ()))
+
+                for key in {tag.lower() for tag in tags}:
+                    self._by_genre.setdefault(key, []).append(item)
+                for mood in moods:
+                    self._by_mood[mood].append(item)
+
+            self._sorted_genres = None
+
+    def random_by_genre(self, genre):
+        """Random record tagged with `genre` as a genre or style, or None"""
+        with self._lock:
+            matching = self._by_genre.get(genre.lower())
+            return random.choice(matching) if matching else None
+
+    def random_by_mood(self, mood):
+        """Random record matching `mood`, or None"""
+        with self._lock:
+            matching = self._by_mood.get(mood.lower())
+            return random.choice(matching) if matching else None
+
+    def genres(self):
+        """Every genre and style, most common first"""
+        with self._lock:
+            if self._sorted_genres is None:
+                self._sorted_genres = sorted(self._counts, key=lambda tag: (-self._counts[tag], tag))
+            return self._sorted_genres
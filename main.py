@@ -3,6 +3,8 @@ Vinyl Collection App - Main Application
 Raspberry Pi 7" Touchscreen Interface
 """
 import os
+import time
+STARTED = time.perf_counter()
 os.environ['KIVY_NO_ARGS'] = '1'
 
 from kivy.app import App
@@ -10,14 +12,51 @@ from kivy.uix.screenmanager import ScreenManager, Screen, FadeTransition
 from kivy.core.window import Window
 from kivy.clock import Clock
 import configparser
+import importlib
 import threading
 
-from discogs_service import DiscogsService
+from metrics import metrics
 from screens.home_screen import HomeScreen
-from screens.collection_screen import CollectionScreen
-from screens.detail_screen import DetailScreen
-from screens.search_screen import SearchScreen
-from screens.jukebox_screen import JukeboxScreen
+from screens.texture_cache import cover_textures
+
+
+# Screens built (and imported) on first navigation - only home is needed
+# for the first frame
+LAZY_SCREENS = {
+    'collection': ('screens.collection_screen', 'CollectionScreen'),
+    'detail': ('screens.detail_screen', 'DetailScreen'),
+    'search': ('screens.search_screen', 'SearchScreen'),
+    'jukebox': ('screens.jukebox_screen', 'JukeboxScreen'),
+}
+
+
+def record_startup(phase):
+    """Time from launch to `phase`, as the startup.<phase> metric"""
+    metrics.observe(f'startup.{phase}', (time.perf_counter() - STARTED) * 1000)
+
+
+class LazyScreenManager(ScreenManager):
+    """ScreenManager that builds LAZY_SCREENS the first time they are asked for"""
+    
+    def get_screen(self, name):
+        # Switching screens (`current = name`) goes through here too
+        if name in LAZY_SCREENS and name not in self.screen_names:
+            with metrics.timer(f'screen.{name}.build'):
+                module_name, class_name = LAZY_SCREENS[name]
+                screen_class = getattr(importlib.import_module(module_name), class_name)
+                self.add_widget(screen_class(name=name))
+        return super().get_screen(name)
+    
+    def on_current(self, instance, value):
+        # Time from switching screens to the first frame drawn afterwards
+        switched = time.perf_counter()
+        
+        def _drawn(window):
+            window.unbind(on_flip=_drawn)
+            metrics.observe(f'screen.{value}.render', (time.perf_counter() - switched) * 1000)
+        
+        super().on_current(instance, value)
+        Window.bind(on_flip=_drawn)
 
 
 class VinylApp(App):
@@ -48,55 +87,159 @@ class VinylApp(App):
             # Bind ESC+Q+Shift as emergency exit
             Window.bind(on_keyboard=self.on_keyboard)
         
-        # Initialize screen manager
-        sm = ScreenManager(transition=FadeTransition())
+        # Decoded cover budget - keep within the Pi's GPU memory split
+        cover_textures.budget = self.config_parser.getint('App', 'texture_cache_mb', fallback=48) * 1024 * 1024
         
-        # Add screens
+        # Initialize screen manager; other screens are built on first visit
+        sm = LazyScreenManager(transition=FadeTransition())
         sm.add_widget(HomeScreen(name='home'))
-        sm.add_widget(CollectionScreen(name='collection'))
-        sm.add_widget(DetailScreen(name='detail'))
-        sm.add_widget(SearchScreen(name='search'))
-        sm.add_widget(JukeboxScreen(name='jukebox'))
         
-        # Initialize Discogs service in background
-        Clock.schedule_once(self.init_discogs, 0.5)
+        Window.bind(on_flip=self.on_first_frame)
+        
+        # Initialize Discogs service once the first frame is up
+        Clock.schedule_once(self.init_discogs, 0)
         
         return sm
     
+    def on_first_frame(self, window):
+        window.unbind(on_flip=self.on_first_frame)
+        record_startup('first_frame')
+        print(f"✓ First frame after {time.perf_counter() - STARTED:.2f}s")
+        # The metrics file and endpoint can wait until something is on screen
+        self.start_metrics()
+    
+    def start_metrics(self):
+        """Write timing metrics to a rotating file in the cache dir, and serve them if configured"""
+        interval = self.config_parser.getint('App', 'metrics_interval', fallback=60)
+        if interval > 0:
+            cache_dir = self.config_parser.get('App', 'cache_dir', fallback='./cache')
+            os.makedirs(cache_dir, exist_ok=True)
+            metrics.start_file(os.path.join(cache_dir, 'metrics.jsonl'), interval)
+        
+        port = self.config_parser.getint('App', 'metrics_port', fallback=0)
+        if port:
+            metrics.start_server(port)
+    
     def load_config(self):
         """Load configuration from config.ini"""
         self.config_parser = configparser.ConfigParser()
         self.config_parser.read('config.ini')
     
     def init_discogs(self, dt):
-        """Initialize Discogs service"""
+        """Initialize Discogs service and load the collection in a background thread"""
+        thread = threading.Thread(target=self.load_collection, daemon=True)
+        thread.start()
+    
+    def create_discogs(self):
+        """Build the Discogs service from config.ini; None if it isn't set up"""
+        # discogs_client, requests and PIL are slow to import on a Pi - keep
+        # them off the startup path
+        from discogs_service import API_URL, DiscogsService
+        
         try:
             token = self.config_parser.get('Discogs', 'user_token')
             username = self.config_parser.get('Discogs', 'username')
             cache_dir = self.config_parser.get('App', 'cache_dir', fallback='./cache')
+            release_ttl = self.config_parser.getfloat('App', 'release_cache_ttl_hours', fallback=720)
+            release_max = self.config_parser.getint('App', 'release_cache_max_entries', fallback=5000)
+            cover_cache_mb = self.config_parser.getint('App', 'cover_cache_mb', fallback=512)
+            api_url = self.config_parser.get('Discogs', 'api_url', fallback=API_URL)
             
-            self.discogs = DiscogsService(token, username, cache_dir)
-            
-            if self.discogs.authenticate():
-                print("✓ Authenticated with Discogs")
-                # Load collection in background
-                Clock.schedule_once(self.load_collection, 0.1)
-            else:
-                print("✗ Failed to authenticate with Discogs")
+            discogs = DiscogsService(
+                token, username, cache_dir,
+                release_cache_ttl_hours=release_ttl,
+                release_cache_max_entries=release_max,
+                cover_cache_mb=cover_cache_mb,
+                api_url=api_url
+            )
         except Exception as e:
             print(f"Configuration error: {e}")
             print("Please update config.ini with your Discogs credentials")
+            return None
+        
+        # Let cards showing a placeholder pick up covers as they arrive
+        discogs.on_cover_downloaded = lambda release_id: Clock.schedule_once(
+            lambda dt: cover_textures.cover_downloaded(release_id), 0
+        )
+        record_startup('service_ready')
+        return discogs
     
-    def load_collection(self, dt):
-        """Load user's vinyl collection in background thread"""
+    def load_collection(self):
+        """Show the cached collection, then authenticate and refresh it (loader thread)"""
+        self.discogs = self.create_discogs()
+        if self.discogs is None:
+            return
+        
         print("Loading collection...")
         
-        def fetch_in_background():
-            self.discogs.get_collection()
+        def on_page(page_items, total_items):
+            Clock.schedule_once(lambda dt: self.on_collection_page(total_items), 0)
+        
+        def on_cached_page(page_items, total_items):
+            record_startup('cached_first_page')
+            on_page(page_items, total_items)
+        
+        # Cached records go on screen before any network traffic, the first
+        # screenful before the rest is read
+        if self.discogs.load_cached_collection(on_page=on_cached_page):
+            record_startup('cached_collection')
             Clock.schedule_once(self.on_collection_loaded, 0)
         
-        thread = threading.Thread(target=fetch_in_background, daemon=True)
-        thread.start()
+        if not self.retry_with_backoff(self.discogs.authenticate, 'authenticate with Discogs'):
+            return
+        print("✓ Authenticated with Discogs")
+        record_startup('authenticated')
+        
+        def refresh():
+            with metrics.timer('collection.refresh'):
+                return self.discogs.get_collection(on_page=on_page) is not None
+        if not self.retry_with_backoff(refresh, 'refresh the collection'):
+            return
+        record_startup('collection_loaded')
+        Clock.schedule_once(self.on_collection_loaded, 0)
+        
+        # Start downloading covers in background; without cache_covers they
+        # are only fetched as they come on screen
+        if self.config_parser.getboolean('App', 'cache_covers', fallback=True):
+            Clock.schedule_once(self.download_covers_background, 1.0)
+    
+    def retry_with_backoff(self, attempt, action, first_delay=5, max_delay=300):
+        """Call `attempt()` until it returns True, backing off between tries.
+
+        Kiosks often boot before the network is up; the cached collection
+        stays usable meanwhile. Gives up (returning False) if Discogs
+        rejects the credentials, which retrying can't fix. Runs on the
+        loader thread.
+        """
+        delay = first_delay
+        while not attempt():
+            error = self.discogs.credentials_error
+            if error:
+                print(f"✗ {error} - check config.ini")
+                self.show_status(f'! {error} - check config.ini')
+                return False
+            
+            print(f"✗ Failed to {action}, retrying in {delay}s")
+            count = len(self.discogs.collection)
+            self.show_status(f'! Offline ({count} cached records) - retrying in {delay}s')
+            time.sleep(delay)
+            delay = min(delay * 2, max_delay)
+        return True
+    
+    def show_status(self, text):
+        """Show `text` in the home screen status line (from any thread)"""
+        def _update(dt):
+            try:
+                self.root.get_screen('home').status_label.text = text
+            except Exception:
+                pass
+        Clock.schedule_once(_update, 0)
+    
+    def on_collection_page(self, total_items):
+        """Called as each page of a cold collection load arrives"""
+        for screen in self.root.screens:
+            if hasattr(screen, 'on_collection_page'):
+                screen.on_collection_page(total_items)
     
     def on_collection_loaded(self, dt):
         """Called when collection loading is complete"""
@@ -106,9 +249,6 @@ class VinylApp(App):
         for screen in self.root.screens:
             if hasattr(screen, 'on_collection_loaded'):
                 screen.on_collection_loaded()
-        
-        # Start downloading covers in background
-        Clock.schedule_once(self.download_covers_background, 1.0)
     
     def download_covers_background(self, dt):
         """Download all album covers in background"""
@@ -143,6 +283,13 @@ class VinylApp(App):
         thread = threading.Thread(target=download_task, daemon=True)
         thread.start()
     
+    def on_stop(self):
+        """Save buffered cover and album access times for the next eviction, and a last metrics snapshot"""
+        if self.discogs:
+            self.discogs.cover_index.flush()
+            self.discogs.release_cache.flush()
+        metrics.write()
+    
     def on_keyboard(self, window, key, scancode, codepoint, modifier):
         """Emergency exit: ESC + Shift + Q"""
         if key == 27 and 'shift' in modifier and codepoint == 'q':  # ESC+Shift+Q
@@ -0,0 +1,193 @@
+"""
+Metrics
+Timing histograms, counters and cache hit ratios for the app's hot paths
+"""
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+
+# Histogram bucket upper bounds in ms; anything slower lands in +Inf
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Histogram:
+    """Count, sum, min/max and bucket counts of observed durations (ms)"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def observe(self, ms):
+        self.count += 1
+        self.total += ms
+        self.min = ms if self.min is None else min(self.min, ms)
+        self.max = ms if self.max is None else max(self.max, ms)
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def percentile(self, share):
+        """Upper bound of the bucket holding the `share` quantile (max for +Inf)"""
+        rank = share * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return BUCKETS_MS[i] if i < len(BUCKETS_MS) else self.max
+        return self.max
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total / self.count, 3) if self.count else None,
+            'min_ms': round(self.min, 3) if self.min is not None else None,
+            'max_ms': round(self.max, 3) if self.max is not None else None,
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'buckets': {
+                **{str(bound): self.buckets[i] for i, bound in enumerate(BUCKETS_MS)},
+                '+Inf': self.buckets[-1],
+            },
+        }
+
+
+class Metrics:
+    """Process-wide registry, safe to use from any thread.
+
+    - `timer(name)` / `observe(name, ms)` feed a histogram
+    - `count(name)` bumps a counter, `hit(name, bool)` a cache hit ratio
+    - `gauge(name, value)` keeps the latest value
+
+    Snapshots go to a rotating JSON-lines file (`start_file`) and, if
+    enabled, to `GET /metrics` on a small HTTP server (`start_server`).
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self._histograms = {}
+        self._counters = {}
+        self._ratios = {}            # name -> [hits, misses]
+        self._gauges = {}
+        self._lock = threading.Lock()
+        self._writer = None
+        self._server = None
+
+    @contextmanager
+    def timer(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - start) * 1000)
+
+    def observe(self, name, ms):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(ms)
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def hit(self, name, hit):
+        with self._lock:
+            ratio = self._ratios.setdefault(name, [0, 0])
+            ratio[0 if hit else 1] += 1
+
+    def gauge(self, name, value):
+        with self._lock:
+            self._gauges[name] = value
+
+    def record_response(self, kind, response, started):
+        """Time, status and rate-limit headroom of an HTTP response started at `started` (perf_counter)"""
+        self.observe(f'{kind}.request', (time.perf_counter() - started) * 1000)
+        self.count(f'{kind}.status.{response.status_code}')
+        remaining = response.headers.get('X-Discogs-Ratelimit-Remaining')
+        if remaining is not None:
+            self.gauge(f'{kind}.ratelimit_remaining', remaining)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'time': datetime.now().isoformat(timespec='seconds'),
+                'uptime_s': round(time.time() - self.started, 1),
+                'timers': {name: h.snapshot() for name, h in sorted(self._histograms.items())},
+                'counters': dict(sorted(self._counters.items())),
+                'hit_ratios': {
+                    name: {
+                        'hits': hits,
+                        'misses': misses,
+                        'ratio': round(hits / (hits + misses), 3) if hits + misses else None,
+                    }
+                    for name, (hits, misses) in sorted(self._ratios.items())
+                },
+                'gauges': dict(sorted(self._gauges.items())),
+            }
+
+    def start_file(self, path, interval=60, max_bytes=1024 * 1024, backups=3):
+        """Append a snapshot to `path` every `interval` seconds, rotating at `max_bytes`"""
+        if self._writer:
+            return
+        # logging and http.server are imported on demand - main.py imports
+        # this module before the first frame
+        import logging
+        from logging.handlers import RotatingFileHandler
+        handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups)
+        self._writer = logging.getLogger('vinyl.metrics')
+        self._writer.propagate = False
+        self._writer.setLevel(logging.INFO)
+        self._writer.addHandler(handler)
+
+        def _write_periodically():
+            while True:
+                time.sleep(interval)
+                self.write()
+
+        threading.Thread(target=_write_periodically, daemon=True, name='metrics').start()
+
+    def write(self):
+        """Append the current snapshot to the metrics file now"""
+        if self._writer:
+            self._writer.info(json.dumps(self.snapshot()))
+
+    def start_server(self, port, host='0.0.0.0'):
+        """Serve the current snapshot as JSON at `GET /metrics`"""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        registry = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = json.dumps(registry.snapshot(), indent=2).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        try:
+            self._server = ThreadingHTTPServer((host, port), _Handler)
+        except OSError as e:
+            print(f"Metrics endpoint unavailable on port {port}: {e}")
+            return
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True, name='metrics-http').start()
+        print(f"Metrics at http://{host}:{port}/metrics")
+
+
+metrics = Metrics()
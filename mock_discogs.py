@@ -0,0 +1,279 @@
+"""
+Mock Discogs
+Local stand-in for the Discogs API and image CDN, for repeatable load and latency testing
+
+    python mock_discogs.py --records 5000 --latency 150 --rate-limit 60
+
+then set `api_url = http://127.0.0.1:8765` in the [Discogs] section of
+config.ini. Serves the identity, collection and release endpoints the app
+uses, plus generated cover images, with configurable latency, random 429s
+(with or without Retry-After) and Discogs' moving-window rate limit
+headers. Prints request statistics on exit (Ctrl+C or SIGTERM).
+"""
+import argparse
+import json
+import random
+import re
+import signal
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timedelta
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from urllib.parse import parse_qs, urlparse
+
+from PIL import Image
+
+from synthetic import synthetic_collection
+
+
+COLLECTION_RE = re.compile(r'^/users/[^/]+/collection/folders/0/releases$')
+RELEASE_RE = re.compile(r'^/releases/(\d+)$')
+IMAGE_RE = re.compile(r'^/images/(\d+)\.jpg$')
+
+
+class MockDiscogs:
+    """Synthetic collection plus the knobs that shape every response"""
+
+    def __init__(self, records, base_url, latency_ms=0, jitter_ms=0, fail_rate=0.0,
+                 rate_limit=60, window=60, image_size=600, retry_after=0):
+        self.base_url = base_url
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.fail_rate = fail_rate
+        self.retry_after = retry_after  # Retry-After seconds sent with every 429 (0 = none)
+        self.rate_limit = rate_limit
+        self.window = window
+        self.image_size = image_size
+
+        self.stats = Counter()
+        self._requests = deque()      # API request times inside the moving window
+        self._lock = threading.Lock()
+
+        # Newest additions first, one hour apart, like a real collection sorted by date added
+        now = datetime.now().astimezone()
+        self.releases = []
+        for n, record in enumerate(records):
+            entry = record.to_dict()
+            entry['date_added'] = (now - timedelta(hours=n)).isoformat(timespec='seconds')
+            self.releases.append(entry)
+        self.by_id = {entry['id']: entry for entry in self.releases}
+
+    def delay(self):
+        """Simulated network latency"""
+        seconds = self.latency + random.uniform(0, self.jitter)
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def take_request(self):
+        """Count an API request against the moving window.
+
+        Returns (allowed, headers) with Discogs' rate limit headers.
+        """
+        with self._lock:
+            now = time.monotonic()
+            while self._requests and now - self._requests[0] > self.window:
+                self._requests.popleft()
+
+            allowed = not self.rate_limit or len(self._requests) < self.rate_limit
+            if allowed:
+                self._requests.append(now)
+            used = len(self._requests)
+
+        if not self.rate_limit:
+            return allowed, {}
+        return allowed, {
+            'X-Discogs-Ratelimit': str(self.rate_limit),
+            'X-Discogs-Ratelimit-Used': str(used),
+            'X-Discogs-Ratelimit-Remaining': str(max(0, self.rate_limit - used)),
+        }
+
+    def identity(self, username='mock'):
+        return {
+            'id': 1,
+            'username': username,
+            'resource_url': f'{self.base_url}/users/{username}',
+            'consumer_name': 'VinylCollectionApp',
+        }
+
+    def collection_page(self, page, per_page, sort_order='desc'):
+        releases = self.releases if sort_order == 'desc' else self.releases[::-1]
+        total = len(releases)
+        pages = max(1, -(-total // per_page))
+        chunk = releases[(page - 1) * per_page:page * per_page]
+        return {
+            'pagination': {'page': page, 'pages': pages, 'per_page': per_page, 'items': total, 'urls': {}},
+            'releases': [
+                {
+                    'id': entry['id'],
+                    'instance_id': entry['instance_id'],
+                    'date_added': entry['date_added'],
+                    'rating': 0,
+                    'basic_information': {
+                        'id': entry['id'],
+                        'title': entry['title'],
+                        'year': entry['year'],
+                        'artists': [{'name': entry['artist'], 'id': 1}],
+                        'thumb': self.image_url(entry['id']),
+                        'cover_image': self.image_url(entry['id']),
+                        'genres': list(entry['genres']),
+                        'styles': list(entry['styles']),
+                    },
+                }
+                for entry in chunk
+            ],
+        }
+
+    def release(self, release_id):
+        entry = self.by_id.get(release_id)
+        if entry is None:
+            return None
+        rng = random.Random(release_id)
+        return {
+            'id': release_id,
+            'resource_url': f'{self.base_url}/releases/{release_id}',
+            'title': entry['title'],
+            'year': entry['year'],
+            'artists': [{'name': entry['artist'], 'id': 1, 'resource_url': f'{self.base_url}/artists/1'}],
+            'genres': list(entry['genres']),
+            'styles': list(entry['styles']),
+            'labels': [{'name': 'Mock Records', 'id': 1, 'catno': f'MOCK-{release_id}'}],
+            'country': 'UK',
+            'notes': 'Served by mock_discogs.py',
+            'images': [{'type': 'primary', 'uri': self.image_url(release_id), 'width': self.image_size,
+                        'height': self.image_size}],
+            'tracklist': [
+                {'position': f'{side}{n}', 'type_': 'track', 'title': f'Track {side}{n}',
+                 'duration': f'{rng.randint(2, 7)}:{rng.randint(0, 59):02d}'}
+                for side in 'AB' for n in range(1, rng.randint(3, 6))
+            ],
+        }
+
+    def image_url(self, release_id):
+        return f'{self.base_url}/images/{release_id}.jpg'
+
+    @lru_cache(maxsize=256)
+    def image(self, release_id):
+        """A solid-color JPEG cover, different for every release"""
+        rng = random.Random(release_id)
+        color = tuple(rng.randint(0, 255) for _ in range(3))
+        buffer = BytesIO()
+        Image.new('RGB', (self.image_size, self.image_size), color).save(buffer, 'JPEG', quality=85)
+        return buffer.getvalue()
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, as the app's pooled session expects
+    mock = None
+    verbose = False
+
+    def do_GET(self):
+        mock = self.mock
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        mock.delay()
+
+        image = IMAGE_RE.match(url.path)
+        if image:
+            mock.stats['image'] += 1
+            if random.random() < mock.fail_rate:
+                return self.send_too_many({})
+            data = mock.image(int(image.group(1)))
+            return self.send_body(200, data, 'image/jpeg')
+
+        allowed, headers = mock.take_request()
+        if not allowed or random.random() < mock.fail_rate:
+            mock.stats['429'] += 1
+            return self.send_too_many(headers)
+
+        if url.path == '/oauth/identity':
+            mock.stats['identity'] += 1
+            return self.send_json(200, mock.identity(), headers)
+
+        if COLLECTION_RE.match(url.path):
+            mock.stats['collection'] += 1
+            page = mock.collection_page(
+                int(query.get('page', 1)),
+                min(int(query.get('per_page', 50)), 500),
+                query.get('sort_order', 'desc'),
+            )
+            return self.send_json(200, page, headers)
+
+        release = RELEASE_RE.match(url.path)
+        if release:
+            mock.stats['release'] += 1
+            data = mock.release(int(release.group(1)))
+            if data is None:
+                return self.send_json(404, {'message': 'Release not found.'}, headers)
+            return self.send_json(200, data, headers)
+
+        mock.stats['not_found'] += 1
+        self.send_json(404, {'message': 'The requested resource was not found.'}, headers)
+
+    def send_too_many(self, headers):
+        if self.mock.retry_after:
+            headers = dict(headers, **{'Retry-After': str(self.mock.retry_after)})
+        self.send_json(429, {'message': 'You are making requests too quickly.'}, headers)
+
+    def send_json(self, status, data, headers=None):
+        self.send_body(status, json.dumps(data).encode('utf-8'), 'application/json', headers)
+
+    def send_body(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.verbose:
+            super().log_message(format, *args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--records', type=int, default=1000, help='collection size')
+    parser.add_argument('--latency', type=float, default=0, help='added to every response (ms)')
+    parser.add_argument('--jitter', type=float, default=0, help='random extra latency, up to this (ms)')
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='share of requests answered with 429')
+    parser.add_argument('--rate-limit', type=int, default=60,
+                        help='API requests allowed per moving minute (0 = unlimited)')
+    parser.add_argument('--retry-after', type=int, default=0,
+                        help='Retry-After seconds sent with 429s (0 = omit, like the image CDN)')
+    parser.add_argument('--image-size', type=int, default=600, help='cover edge in px')
+    parser.add_argument('--verbose', action='store_true', help='log every request')
+    args = parser.parse_args()
+
+    base_url = f'http://{args.host}:{args.port}'
+    MockHandler.mock = MockDiscogs(
+        synthetic_collection(args.records), base_url,
+        latency_ms=args.latency, jitter_ms=args.jitter, fail_rate=args.fail_rate,
+        rate_limit=args.rate_limit, image_size=args.image_size, retry_after=args.retry_after,
+    )
+    MockHandler.verbose = args.verbose
+
+    server = ThreadingHTTPServer((args.host, args.port), MockHandler)
+    server.daemon_threads = True
+    # Scripted load tests stop it with `kill`; print the statistics then too
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print(f"Mock Discogs serving {args.records} records at {base_url}")
+    print(f"Set api_url = {base_url} in the [Discogs] section of config.ini")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        stats = MockHandler.mock.stats
+        print("\nRequests served: " + ', '.join(f"{name} {count}" for name, count in sorted(stats.items())))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Rate Limiter
+Thread-safe token bucket shared by every worker talking to Discogs
+"""
+import threading
+import time
+from collections import deque
+
+
+class RateLimiter:
+    """Token bucket that also follows Discogs' own rate-limit feedback.
+
+    `rate` tokens are added per second up to `burst`. Workers call
+    `acquire()` before each request and `observe()` with the response so
+    the bucket can back off when `X-Discogs-Ratelimit-Remaining` runs low
+    or the server answers 429.
+
+    Discogs counts requests over a moving window, so backing off means
+    waiting until enough earlier requests have left it. The limiter keeps
+    the send times of its own requests to know when that is. A 429 without
+    Discogs' rate-limit headers (e.g. from the image CDN) says nothing
+    about that window, so it gets a short backoff that doubles on repeats.
+    """
+
+    def __init__(self, rate=5.0, burst=5, window=60, low_water=2, backoff=2, max_backoff=8):
+        self.rate = rate
+        self.burst = burst
+        self.window = window          # Discogs counts requests over a moving 60s window
+        self.low_water = low_water    # Start pacing when this few requests remain
+        self.backoff = backoff        # First wait after a 429 without rate-limit headers
+        self.max_backoff = max_backoff
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._paused_until = 0.0
+        self._sent = deque()          # send times of requests still inside the window
+        self._backoffs = 0            # 429s without rate-limit headers since the last success
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may be sent"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    self._sent.append(now)
+                    self._forget_sent(now)
+                    return
+                else:
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def observe(self, response):
+        """Adjust pacing from a response's status code and rate-limit headers"""
+        headers = response.headers
+        if response.status_code == 429:
+            self.pause(self._retry_after(headers))
+            return
+        self._backoffs = 0
+
+        limit = self._int_header(headers, 'X-Discogs-Ratelimit') or 60
+
+        remaining = self._int_header(headers, 'X-Discogs-Ratelimit-Remaining')
+        if remaining is None or remaining > self.low_water:
+            return
+
+        # Nearly out of budget - wait until the window has room above low water again
+        used = self._int_header(headers, 'X-Discogs-Ratelimit-Used')
+        if used is None:
+            used = limit - remaining
+        self.pause(self._window_frees(self.low_water - remaining + 1, used, limit))
+
+    def pause(self, seconds):
+        """Hold every worker for `seconds` and drain the bucket"""
+        with self._lock:
+            now = time.monotonic()
+            self._paused_until = max(self._paused_until, now + seconds)
+            self._tokens = 0.0
+            self._last = now
+
+    def _refill(self, now):
+        elapsed = now - self._last
+        self._last = now
+        if now >= self._paused_until:
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+
+    def _forget_sent(self, now):
+        while self._sent and now - self._sent[0] > self.window:
+            self._sent.popleft()
+
+    def _window_frees(self, count, used, limit):
+        """Seconds until `count` requests have left the moving window"""
+        with self._lock:
+            now = time.monotonic()
+            self._forget_sent(now)
+            if len(self._sent) >= count:
+                # Our oldest requests leave first; the server saw them a moment after we sent them
+                return max(1.0, self._sent[count - 1] + self.window - now + 1)
+        # Requests made elsewhere with the same token - assume they were spread over the window
+        return max(1.0, self.window * used / limit)
+
+    def _retry_after(self, headers):
+        retry_after = headers.get('Retry-After')
+        try:
+            return max(1.0, float(retry_after))
+        except (TypeError, ValueError):
+            pass
+
+        limit = self._int_header(headers, 'X-Discogs-Ratelimit')
+        used = self._int_header(headers, 'X-Discogs-Ratelimit-Used')
+        if limit is None and used is None:
+            with self._lock:
+                self._backoffs += 1
+                return min(self.max_backoff, self.backoff * 2 ** (self._backoffs - 1))
+
+        limit = limit or 60
+        return self._window_frees(1, limit if used is None else used, limit)
+
+    @staticmethod
+    def _int_header(headers, name):
+        try:
+            return int(headers.get(name))
+        except (TypeError, ValueError):
+            return None
@@ -0,0 +1,72 @@
+"""
+Collection Records
+Compact in-memory representation of collection entries
+"""
+import sys
+
+
+# date_added is only needed in collection.db (see CollectionStore), so it
+# isn't held in memory
+FIELDS = ('id', 'instance_id', 'title', 'artist', 'year',
+          'thumb', 'cover', 'genres', 'styles')
+_FIELD_SET = frozenset(FIELDS)
+
+# One shared tuple per distinct genre/style combination
+_tag_tuples = {}
+
+
+def _intern_tags(tags):
+    if type(tags) is tuple:
+        shared = _tag_tuples.get(tags)
+        if shared is not None:
+            return shared
+    key = tuple(sys.intern(tag) for tag in tags or ())
+    return _tag_tuples.setdefault(key, key)
+
+
+class Record:
+    """One collection entry.
+
+    Uses __slots__ instead of a per-record dict, interns artist names and
+    shares genre/style tuples between records, which cuts memory several
+    times over for large collections. Supports the dict-style access the
+    screens use (`record['title']`, `record.get('year', 'N/A')`).
+    """
+
+    __slots__ = FIELDS
+
+    def __init__(self, id, title, artist, year='N/A', thumb=None, cover=None,
+                 genres=(), styles=(), instance_id=None):
+        self.id = id
+        self.instance_id = instance_id
+        self.title = title
+        self.artist = sys.intern(artist) if isinstance(artist, str) else artist
+        self.year = year
+        # The thumb URL is only a fallback for a missing cover; skip storing both
+        self.thumb = None if cover else thumb
+        self.cover = cover
+        self.genres = _intern_tags(genres)
+        self.styles = _intern_tags(styles)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{field: data[field] for field in FIELDS if field in data})
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in FIELDS}
+
+    def __getitem__(self, key):
+        if key not in _FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        if key not in _FIELD_SET:
+            return default
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key in _FIELD_SET
+
+    def __repr__(self):
+        return f"Record(id={self.id!r}, title={self.title!r}, artist={self.artist!r})"
@@ -0,0 +1,129 @@
+"""
+Release Details Cache
+Persistent SQLite store for Discogs release details with an in-memory hot layer
+"""
+import os
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from cache_files import open_database
+
+
+class ReleaseCache:
+    """Release details keyed by release id, with TTL and LRU eviction.
+
+    Entries live in `<cache_dir>/releases.db`. The most recently used
+    entries are also kept in memory so repeat views skip SQLite entirely;
+    access times are buffered and written with the next `put` or `flush`.
+    """
+
+    def __init__(self, cache_dir, ttl_hours=720, max_entries=5000, memory_entries=200):
+        self.db_path = os.path.join(cache_dir, 'releases.db')
+        self.ttl = ttl_hours * 3600
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self._memory = OrderedDict()  # release_id -> (fetched_at, details)
+        self._accessed = {}           # release_id -> accessed_at not yet written
+        self._lock = threading.Lock()
+
+        # Accessed from the UI thread and worker threads, guarded by _lock
+        self._db = open_database(self.db_path)
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS releases ('
+            ' id INTEGER PRIMARY KEY,'
+            ' data TEXT NOT NULL,'
+            ' fetched_at REAL NOT NULL,'
+            ' accessed_at REAL NOT NULL)'
+        )
+        self._db.execute('CREATE INDEX IF NOT EXISTS releases_accessed ON releases (accessed_at)')
+        self._db.commit()
+
+    def get(self, release_id, allow_stale=False):
+        """Return cached details, or None if missing (or expired unless `allow_stale`)"""
+        release_id = int(release_id)
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(release_id)
+            if entry is not None:
+                self._memory.move_to_end(release_id)
+            else:
+                row = self._db.execute(
+                    'SELECT fetched_at, data FROM releases WHERE id = ?', (release_id,)
+                ).fetchone()
+                if row is None:
+                    return None
+                try:
+                    entry = (row[0], json.loads(row[1]))
+                except ValueError:
+                    self._db.execute('DELETE FROM releases WHERE id = ?', (release_id,))
+                    self._db.commit()
+                    return None
+                self._remember(release_id, entry)
+
+            self._accessed[release_id] = now
+
+        fetched_at, details = entry
+        if not allow_stale and now - fetched_at > self.ttl:
+            return None
+        return details
+
+    def put(self, release_id, details):
+        """Store details for a release, evicting least recently used entries"""
+        release_id = int(release_id)
+        now = time.time()
+
+        with self._lock:
+            # Eviction below goes by access time - bring the table up to date first
+            self._flush()
+            self._db.execute(
+                'INSERT OR REPLACE INTO releases (id, data, fetched_at, accessed_at) VALUES (?, ?, ?, ?)',
+                (release_id, json.dumps(details), now, now)
+            )
+            self._remember(release_id, (now, details))
+            self._evict()
+            self._db.commit()
+
+    def clear(self):
+        """Drop every cached release"""
+        with self._lock:
+            self._memory.clear()
+            self._accessed.clear()
+            self._db.execute('DELETE FROM releases')
+            self._db.commit()
+
+    def flush(self):
+        """Write buffered access times"""
+        with self._lock:
+            self._flush()
+            self._db.commit()
+
+    def _flush(self):
+        if not self._accessed:
+            return
+        self._db.executemany(
+            'UPDATE releases SET accessed_at = ? WHERE id = ?',
+            [(at, release_id) for release_id, at in self._accessed.items()]
+        )
+        self._accessed.clear()
+
+    def _remember(self, release_id, entry):
+        self._memory[release_id] = entry
+        self._memory.move_to_end(release_id)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self):
+        count = self._db.execute('SELECT COUNT(*) FROM releases').fetchone()[0]
+        excess = count - self.max_entries
+        if excess <= 0:
+            return
+
+        evicted = self._db.execute(
+            'SELECT id FROM releases ORDER BY accessed_at LIMIT ?', (excess,)
+        ).fetchall()
+        self._db.executemany('DELETE FROM releases WHERE id = ?', evicted)
+        for (release_id,) in evicted:
+            self._memory.pop(release_id, None)
@@ -3,26 +3,31 @@ Collection Screen - Browse vinyl collection
 """
 from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
-from kivy.uix.scrollview import ScrollView
-from kivy.uix.gridlayout import GridLayout
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.recyclegridlayout import RecycleGridLayout
 from kivy.uix.button import Button
 from kivy.uix.label import Label
 from kivy.uix.image import Image
 from kivy.graphics import Color, Rectangle, RoundedRectangle
 from kivy.metrics import dp
 from kivy.clock import Clock
-import os
 
+from screens.texture_cache import cover_textures
 
-class AlbumCard(BoxLayout):
-    def __init__(self, album_data, callback, **kwargs):
+
+class AlbumCard(RecycleDataViewBehavior, BoxLayout):
+    """Album tile. Widgets are built once and rebound with `set_album`,
+    so the same card can be recycled by a RecycleView."""
+    
+    def __init__(self, album_data=None, callback=None, **kwargs):
         super().__init__(**kwargs)
         self.orientation = 'vertical'
         self.size_hint = (None, None)
         self.size = (dp(160), dp(200))
         self.padding = dp(5)
         self.spacing = dp(5)
-        self.album_data = album_data
+        self.album_data = None
         self.callback = callback
         
         # Background
@@ -33,33 +38,25 @@ class AlbumCard(BoxLayout):
         self.bind(pos=self.update_bg, size=self.update_bg)
         
         # Album cover button
-        cover_btn = Button(
+        self.cover_btn = Button(
             size_hint=(1, 0.7),
             background_normal='',
             background_color=(0.2, 0.2, 0.25, 1)
         )
+        self.cover_img = Image(allow_stretch=True, keep_ratio=True)
+        self.placeholder = Label(text='♪', font_size=dp(40))
+        self.cover_btn.add_widget(self.cover_img)
+        self.cover_btn.add_widget(self.placeholder)
+        # Button isn't a layout - keep the cover and placeholder on top of it
+        self.cover_btn.bind(pos=self.update_cover, size=self.update_cover)
         
-        # Use cached image only
-        cache_path = f"./cache/{album_data['id']}.jpg"
-        if os.path.exists(cache_path):
-            cover_img = Image(
-                source=cache_path,
-                allow_stretch=True,
-                keep_ratio=True
-            )
-            cover_btn.add_widget(cover_img)
-        else:
-            placeholder = Label(text='♪', font_size=dp(40))
-            cover_btn.add_widget(placeholder)
-        
-        cover_btn.bind(on_press=lambda x: self.callback(album_data))
-        self.add_widget(cover_btn)
+        self.cover_btn.bind(on_press=self.on_cover_press)
+        self.add_widget(self.cover_btn)
         
         # Album info
         info_layout = BoxLayout(orientation='vertical', size_hint=(1, 0.3), spacing=dp(2))
         
-        title = Label(
-            text=album_data['title'][:25] + '...' if len(album_data['title']) > 25 else album_data['title'],
+        self.title_label = Label(
             font_size=dp(11),
             bold=True,
             size_hint=(1, 0.6),
@@ -67,21 +64,137 @@ class AlbumCard(BoxLayout):
             halign='center',
             valign='middle'
         )
-        title.bind(size=title.setter('text_size'))
+        self.title_label.bind(size=self.title_label.setter('text_size'))
         
-        artist = Label(
-            text=album_data['artist'][:25] + '...' if len(album_data['artist']) > 25 else album_data['artist'],
+        self.artist_label = Label(
             font_size=dp(9),
             size_hint=(1, 0.4),
             color=(0.7, 0.7, 0.7, 1),
             halign='center',
             valign='middle'
         )
-        artist.bind(size=artist.setter('text_size'))
+        self.artist_label.bind(size=self.artist_label.setter('text_size'))
         
-        info_layout.add_widget(title)
-        info_layout.add_widget(artist)
+        info_layout.add_widget(self.title_label)
+        info_layout.add_widget(self.artist_label)
         self.add_widget(info_layout)
+        
+        if album_data:
+            self.set_album(album_data)
+    
+    def set_album(self, album_data):
+        """Show `album_data` on this card"""
+        self.album_data = album_data
+        self.title_label.text = album_data['title'][:25] + '...' if len(album_data['title']) > 25 else album_data['title']
+        self.artist_label.text = album_data['artist'][:25] + '...' if len(album_data['artist']) > 25 else album_data['artist']
+        
+        # Placeholder until the cover is decoded (or downloaded) off the main thread
+        self.show_cover(None)
+        release_id = album_data['id']
+        # Replaces whatever this card was still waiting on before it was recycled
+        cover_textures.request(
+            release_id, 'grid', lambda texture: self.on_cover_ready(release_id, texture), owner=self
+        )
+    
+    def on_cover_ready(self, release_id, texture):
+        # The card may have been recycled for another album meanwhile
+        if self.album_data and self.album_data['id'] == release_id:
+            self.show_cover(texture)
+    
+    def show_cover(self, texture):
+        self.cover_img.texture = texture
+        self.cover_img.opacity = 1 if texture else 0
+        self.placeholder.opacity = 0 if texture else 1
+    
+    def refresh_view_attrs(self, rv, index, data):
+        """RecycleView hook - rebind this card to another record"""
+        self.callback = data['callback']
+        self.set_album(data['album'])
+        return super().refresh_view_attrs(rv, index, {})
+    
+    def on_cover_press(self, instance):
+        if self.callback and self.album_data:
+            self.callback(self.album_data)
+    
+    def update_bg(self, instance, value):
+        self.bg.pos = instance.pos
+        self.bg.size = instance.size
+    
+    def update_cover(self, instance, value):
+        for child in (self.cover_img, self.placeholder):
+            child.pos = instance.pos
+            child.size = instance.size
+
+
+class AlbumGrid(RecycleView):
+    """Scrolling album grid that keeps a small pool of AlbumCards and
+    rebinds them to records as they scroll into view"""
+    
+    def __init__(self, callback, **kwargs):
+        super().__init__(**kwargs)
+        self.callback = callback
+        self.do_scroll_x = False
+        self.do_scroll_y = True
+        self.bar_width = dp(10)
+        self.viewclass = AlbumCard
+        
+        self.grid = RecycleGridLayout(
+            cols=4,
+            spacing=dp(15),
+            padding=dp(15),
+            default_size=(dp(160), dp(200)),
+            default_size_hint=(None, None),
+            size_hint_y=None
+        )
+        self.grid.bind(minimum_height=self.grid.setter('height'))
+        self.add_widget(self.grid)
+        
+        # Whatever comes into view gets its covers downloaded first
+        self._prioritize_trigger = Clock.create_trigger(self.prioritize_visible, 0.25)
+        self.bind(scroll_y=self._prioritize_trigger, height=self._prioritize_trigger, data=self._prioritize_trigger)
+    
+    def set_albums(self, albums):
+        """Show exactly `albums`"""
+        self.data = [{'album': album, 'callback': self.callback} for album in albums]
+    
+    def append_albums(self, albums):
+        """Add `albums` after the ones already shown"""
+        self.data.extend({'album': album, 'callback': self.callback} for album in albums)
+    
+    def row_height(self):
+        return dp(200) + dp(15)
+    
+    def visible_range(self):
+        """(first, last) 1-based record numbers currently in view"""
+        total = len(self.data)
+        if not total:
+            return 0, 0
+        cols = self.grid.cols
+        scrollable = max(0, self.grid.height - self.height)
+        top = (1 - self.scroll_y) * scrollable
+        first_row = int(top // self.row_height())
+        rows = int(self.height // self.row_height()) + 1  # include the partly visible row
+        first = min(total, first_row * cols + 1)
+        last = min(total, (first_row + rows) * cols)
+        return first, last
+    
+    def prioritize_visible(self, *args):
+        """Move covers for the records in view, and the next screenful, to the front of the download queue"""
+        from kivy.app import App
+        app = App.get_running_app()
+        first, last = self.visible_range()
+        if not app.discogs or not last:
+            return
+        ahead = last - first + 1
+        app.discogs.prioritize_covers([entry['album'] for entry in self.data[first - 1:last + ahead]])
+    
+    def scroll_screens(self, delta):
+        """Scroll by `delta` screenfuls"""
+        scrollable = self.grid.height - self.height
+        if scrollable <= 0:
+            return
+        self.scroll_y = max(0, min(1, self.scroll_y - delta * self.height / scrollable))
+
 
 class CollectionPager(BoxLayout):
     def __init__(self, **kwargs):
@@ -93,21 +206,18 @@ class CollectionPager(BoxLayout):
         
         self.prev_btn = Button(text='PREV', size_hint=(None, 1), width=dp(100), background_normal='', background_color=(0.2,0.2,0.3,1))
         self.next_btn = Button(text='NEXT', size_hint=(None, 1), width=dp(100), background_normal='', background_color=(0.2,0.2,0.3,1))
-        self.page_label = Label(text='Page 1/1', halign='center')
+        self.page_label = Label(text='0 records', halign='center')
         self.page_label.bind(size=self.page_label.setter('text_size'))
 
         self.add_widget(self.prev_btn)
         self.add_widget(self.page_label)
         self.add_widget(self.next_btn)
-    
-    def update_bg(self, instance, value):
-        self.bg.pos = instance.pos
-        self.bg.size = instance.size
 
 
 class CollectionScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        self.shown_collection = None
         self.build_ui()
     
     def build_ui(self):
@@ -146,22 +256,15 @@ class CollectionScreen(Screen):
         
         layout.add_widget(header)
         
-        # Scroll view for albums
-        scroll = ScrollView(do_scroll_x=False, do_scroll_y=True, bar_width=dp(10))
-        
-        self.albums_grid = GridLayout(
-            cols=4,
-            spacing=dp(15),
-            padding=dp(15),
-            size_hint_y=None
-        )
-        self.albums_grid.bind(minimum_height=self.albums_grid.setter('height'))
+        # Recycled grid over the whole collection
+        self.albums_grid = AlbumGrid(self.show_detail)
+        self.albums_grid.bind(scroll_y=self._update_pager_label, height=self._update_pager_label)
+        layout.add_widget(self.albums_grid)
         
-        scroll.add_widget(self.albums_grid)
-        layout.add_widget(scroll)
-        
-        # Pager
+        # Pager - jumps a screenful at a time
         self.pager = CollectionPager()
+        self.pager.prev_btn.bind(on_press=lambda *_: self.change_page(-1))
+        self.pager.next_btn.bind(on_press=lambda *_: self.change_page(1))
         layout.add_widget(self.pager)
         
         self.add_widget(layout)
@@ -174,56 +277,40 @@ class CollectionScreen(Screen):
         """Load albums when entering screen"""
         Clock.schedule_once(self.load_albums, 0.1)
         
-    def _setup_pagination(self):
+    def load_albums(self, dt):
+        """Bind the grid to the current collection, adding only what's new"""
         from kivy.app import App
         app = App.get_running_app()
-        total = len(app.discogs.collection) if app.discogs and app.discogs.collection else 0
-        self.per_page = 16
-        self.current_page = 1
-        self.total_pages = max(1, (total + self.per_page - 1) // self.per_page)
-
-        # wire pager buttons
-        self.pager.prev_btn.bind(on_press=lambda *_: self.change_page(-1))
-        self.pager.next_btn.bind(on_press=lambda *_: self.change_page(1))
+        collection = app.discogs.collection if app.discogs else []
+        
+        if collection is self.shown_collection:
+            # Same collection, possibly grown while streaming in
+            shown = len(self.albums_grid.data)
+            if len(collection) > shown:
+                self.albums_grid.append_albums(collection[shown:])
+        else:
+            # A refreshed collection - keep the user's place rather than jump to the top
+            self.shown_collection = collection
+            self.albums_grid.set_albums(collection)
+        
         self._update_pager_label()
     
-    def load_albums(self, dt):
-        """Load and display albums"""
-        self.albums_grid.clear_widgets()
-        from kivy.app import App
-        app = App.get_running_app()
-        if app.discogs and app.discogs.collection:
-            # Setup pagination state
-            if not hasattr(self, 'per_page'):
-                self._setup_pagination()
-
-            # Render current page
-            start = (self.current_page - 1) * self.per_page
-            end = start + self.per_page
-            page_items = app.discogs.collection[start:end]
-            for album in page_items:
-                card = AlbumCard(album, self.show_detail)
-                self.albums_grid.add_widget(card)
+    def on_collection_page(self, total_items):
+        """Called as each page of the collection arrives"""
+        self.load_albums(0)
     
     def on_collection_loaded(self):
         """Called when collection is loaded"""
-        if self.manager.current == 'collection':
-            Clock.schedule_once(self.load_albums, 0.1)
-        else:
-            # Ensure pagination updated even when not on screen
-            try:
-                self._setup_pagination()
-            except Exception:
-                pass
+        self.load_albums(0)
 
     def change_page(self, delta):
-        """Change current page and re-render"""
-        self.current_page = max(1, min(self.total_pages, self.current_page + delta))
-        self._update_pager_label()
-        Clock.schedule_once(self.load_albums, 0.05)
+        """Scroll by a screenful"""
+        self.albums_grid.scroll_screens(delta)
 
-    def _update_pager_label(self):
-        self.pager.page_label.text = f'Page {self.current_page}/{self.total_pages}'
+    def _update_pager_label(self, *args):
+        first, last = self.albums_grid.visible_range()
+        total = len(self.albums_grid.data)
+        self.pager.page_label.text = f'{first}-{last} of {total}' if total else '0 records'
     
     def show_detail(self, album_data):
         """Navigate to detail screen"""
@@ -10,13 +10,16 @@ from kivy.uix.image import Image
 from kivy.graphics import Color, Rectangle, RoundedRectangle
 from kivy.metrics import dp
 from kivy.clock import Clock
-import os
+
+from screens.texture_cache import cover_textures
 
 
 class DetailScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.current_album = None
+        self._details_request = 0
+        self.loading_label = None
         self.build_ui()
     
     def build_ui(self):
@@ -71,10 +74,22 @@ class DetailScreen(Screen):
     def set_album(self, album_data):
         """Set the album to display"""
         self.current_album = album_data
-        Clock.schedule_once(self.load_details, 0.1)
+        # Any in-flight details response for a previous album is now stale
+        self._details_request += 1
+        request_id = self._details_request
+        
+        from kivy.app import App
+        app = App.get_running_app()
+        if app.discogs:
+            app.discogs.prioritize_covers([album_data])
+        Clock.schedule_once(lambda dt: self.load_details(request_id), 0.1)
     
-    def load_details(self, dt):
+    def load_details(self, request_id):
         """Load and display album details"""
+        if request_id != self._details_request:
+            # Another tap came in before this one was shown
+            return
+        
         self.content_layout.clear_widgets()
         
         if not self.current_album:
@@ -88,19 +103,25 @@ class DetailScreen(Screen):
             spacing=dp(20)
         )
         
-        # Cover image
+        # Cover image - placeholder until it's decoded, or downloaded (it was
+        # moved to the front of the download queue in set_album)
         cover_container = BoxLayout(size_hint=(None, 1), width=dp(200))
-        cache_path = f"./cache/{self.current_album['id']}.jpg"
-        if os.path.exists(cache_path):
-            cover_img = Image(
-                source=cache_path,
-                allow_stretch=True,
-                keep_ratio=True
-            )
-            cover_container.add_widget(cover_img)
-        else:
-            placeholder = Label(text='♪', font_size=dp(80))
-            cover_container.add_widget(placeholder)
+        placeholder = Label(text='♪', font_size=dp(80))
+        cover_container.add_widget(placeholder)
+        release_id = self.current_album['id']
+        
+        def on_cover(texture):
+            # The user may have moved on to another album meanwhile
+            if self.current_album and self.current_album['id'] == release_id:
+                cover_container.clear_widgets()
+                cover_img = Image(
+                    texture=texture,
+                    allow_stretch=True,
+                    keep_ratio=True
+                )
+                cover_container.add_widget(cover_img)
+        
+        cover_textures.request(release_id, 'large', on_cover, owner=self)
         
         top_section.add_widget(cover_container)
         
@@ -168,12 +189,34 @@ class DetailScreen(Screen):
         from kivy.app import App
         app = App.get_running_app()
         if app.discogs:
-            Clock.schedule_once(lambda dt: self.load_full_details(app.discogs), 0.2)
+            self.load_full_details(app.discogs, request_id)
     
-    def load_full_details(self, discogs_service):
-        """Load full release details from Discogs"""
-        release_id = self.current_album['id']
-        details = discogs_service.get_release_details(release_id)
+    def load_full_details(self, discogs_service, request_id):
+        """Request full release details from Discogs without blocking the UI"""
+        self.loading_label = Label(
+            text='Loading details...',
+            font_size=dp(14),
+            size_hint=(1, None),
+            height=dp(30),
+            color=(0.6, 0.6, 0.6, 1)
+        )
+        self.content_layout.add_widget(self.loading_label)
+        
+        def on_fetched(release_id, details):
+            # Runs on a worker thread - hop back to the main thread
+            Clock.schedule_once(lambda dt: self.show_full_details(request_id, details), 0)
+        
+        discogs_service.get_release_details_async(self.current_album['id'], callback=on_fetched)
+    
+    def show_full_details(self, request_id, details):
+        """Render full release details once they arrive"""
+        if request_id != self._details_request:
+            # User has moved on to another album
+            return
+        
+        if self.loading_label is not None:
+            self.content_layout.remove_widget(self.loading_label)
+            self.loading_label = None
         
         if not details:
             return
@@ -80,6 +80,15 @@ class HomeScreen(Screen):
         self.bg_rect.pos = instance.pos
         self.bg_rect.size = instance.size
     
+    def on_collection_page(self, total_items):
+        """Called as each page of the collection arrives"""
+        from kivy.app import App
+        app = App.get_running_app()
+        count = len(app.discogs.collection)
+        username = app.discogs.username
+        self.title_label.text = f'[b]{username.upper()}\'S VINYL COLLECTION[/b]'
+        self.status_label.text = f'> Loading records: {count}/{total_items}'
+    
     def on_collection_loaded(self):
         """Called when collection is loaded"""
         from kivy.app import App
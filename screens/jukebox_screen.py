@@ -11,7 +11,8 @@ from kivy.uix.image import Image
 from kivy.graphics import Color, Rectangle, RoundedRectangle
 from kivy.metrics import dp
 from kivy.animation import Animation
-import os
+
+from screens.texture_cache import cover_textures
 
 
 class MoodButton(Button):
@@ -259,6 +260,11 @@ class JukeboxScreen(Screen):
         self.result_container.clear_widgets()
         self.current_selection = album
         
+        from kivy.app import App
+        app = App.get_running_app()
+        if app.discogs:
+            app.discogs.prioritize_covers([album])
+        
         # Selection type label
         type_label = Label(
             text=f'[b]YOUR SELECTION: {selection_type}[/b]',
@@ -287,17 +293,22 @@ class JukeboxScreen(Screen):
         
         cover_box.bind(pos=self.update_cover_bg, size=self.update_cover_bg)
         
-        cache_path = f"./cache/{album['id']}.jpg"
-        if os.path.exists(cache_path):
-            cover_img = Image(
-                source=cache_path,
-                allow_stretch=True,
-                keep_ratio=True
-            )
-            cover_box.add_widget(cover_img)
-        else:
-            placeholder = Label(text='♪', font_size=dp(80))
-            cover_box.add_widget(placeholder)
+        # Placeholder until the cover is decoded, or downloaded
+        placeholder = Label(text='♪', font_size=dp(80))
+        cover_box.add_widget(placeholder)
+        
+        def on_cover(texture):
+            # Another pick may have replaced this one meanwhile
+            if self.current_selection is album:
+                cover_box.clear_widgets()
+                cover_img = Image(
+                    texture=texture,
+                    allow_stretch=True,
+                    keep_ratio=True
+                )
+                cover_box.add_widget(cover_img)
+        
+        cover_textures.request(album['id'], 'large', on_cover, owner=self)
         
         album_container.add_widget(cover_box)
         
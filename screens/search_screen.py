@@ -3,8 +3,6 @@ Search Screen - Search vinyl collection
 """
 from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
-from kivy.uix.scrollview import ScrollView
-from kivy.uix.gridlayout import GridLayout
 from kivy.uix.button import Button
 from kivy.uix.label import Label
 from kivy.uix.textinput import TextInput
@@ -12,12 +10,17 @@ from kivy.graphics import Color, Rectangle
 from kivy.metrics import dp
 from kivy.clock import Clock
 
-from screens.collection_screen import AlbumCard
+from screens.collection_screen import AlbumGrid
 
 
 class SearchScreen(Screen):
+    # Results are materialised in batches of this size ("LOAD MORE" adds the next)
+    results_batch = 100
+    
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        self.query = ''
+        self.total_results = 0
         self.build_ui()
     
     def build_ui(self):
@@ -102,19 +105,22 @@ class SearchScreen(Screen):
         )
         layout.add_widget(self.results_label)
         
-        # Scroll view for results
-        scroll = ScrollView(do_scroll_x=False, do_scroll_y=True, bar_width=dp(10))
+        # Recycled grid - only visible result cards are built
+        self.results_grid = AlbumGrid(self.show_detail)
+        layout.add_widget(self.results_grid)
         
-        self.results_grid = GridLayout(
-            cols=4,
-            spacing=dp(15),
-            padding=dp(15),
-            size_hint_y=None
+        self.more_btn = Button(
+            text='LOAD MORE',
+            size_hint=(1, None),
+            height=0,
+            opacity=0,
+            disabled=True,
+            background_normal='',
+            background_color=(0.2, 0.2, 0.3, 1),
+            font_size=dp(14)
         )
-        self.results_grid.bind(minimum_height=self.results_grid.setter('height'))
-        
-        scroll.add_widget(self.results_grid)
-        layout.add_widget(scroll)
+        self.more_btn.bind(on_press=self.load_more)
+        layout.add_widget(self.more_btn)
         
         self.add_widget(layout)
     
@@ -138,30 +144,58 @@ class SearchScreen(Screen):
     def do_search(self, instance):
         """Perform search"""
         query = self.search_input.text.strip()
+        self.query = ''
+        self.total_results = 0
+        self.results_grid.set_albums([])
+        self._update_more_btn()
         
         if not query:
             self.results_label.text = 'Enter search query above'
-            self.results_grid.clear_widgets()
             return
         
-        self.results_grid.clear_widgets()
-        
         from kivy.app import App
         app = App.get_running_app()
         if not app.discogs or not app.discogs.collection:
             self.results_label.text = 'Collection not loaded'
             return
         
-        results = app.discogs.search_collection(query)
+        self.query = query
+        self.total_results = app.discogs.count_search_results(query)
         
-        if results:
-            self.results_label.text = f'Found {len(results)} result(s)'
-            for album in results:
-                card = AlbumCard(album, self.show_detail)
-                self.results_grid.add_widget(card)
+        if self.total_results:
+            self.results_grid.set_albums(app.discogs.search_collection(query, limit=self.results_batch))
+            self.results_grid.scroll_y = 1
+            self._update_results()
         else:
             self.results_label.text = f'No results found for "{query}"'
     
+    def load_more(self, instance):
+        """Show the next batch of results for the current query"""
+        from kivy.app import App
+        app = App.get_running_app()
+        if not self.query or not app.discogs:
+            return
+        
+        shown = len(self.results_grid.data)
+        self.results_grid.append_albums(
+            app.discogs.search_collection(self.query, limit=self.results_batch, offset=shown)
+        )
+        self._update_results()
+    
+    def _update_results(self):
+        shown = len(self.results_grid.data)
+        if shown < self.total_results:
+            self.results_label.text = f'Showing {shown} of {self.total_results} results'
+        else:
+            self.results_label.text = f'Found {self.total_results} result(s)'
+        self._update_more_btn()
+    
+    def _update_more_btn(self):
+        more = len(self.results_grid.data) < self.total_results
+        self.more_btn.disabled = not more
+        self.more_btn.opacity = 1 if more else 0
+        self.more_btn.height = dp(50) if more else 0
+    
     def show_detail(self, album_data):
         """Navigate to detail screen"""
         detail_screen = self.manager.get_screen('detail')
@@ -173,9 +207,15 @@ class SearchScreen(Screen):
         # Auto-focus search input to show keyboard
         Clock.schedule_once(lambda dt: setattr(self.search_input, 'focus', True), 0.1)
     
+    def on_collection_page(self, total_items):
+        """Called as each page of the collection arrives"""
+        # Refresh an open search so it picks up newly arrived records
+        if self.manager.current == 'search' and len(self.search_input.text.strip()) >= 2:
+            self.on_search_text(self.search_input, self.search_input.text)
+    
     def on_collection_loaded(self):
         """Called when collection is loaded"""
-        pass
+        self.on_collection_page(None)
     
     def go_back(self, instance):
         self.manager.current = 'home'
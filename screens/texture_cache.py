@@ -0,0 +1,184 @@
+"""
+Cover Texture Cache - Decoded album covers shared by every screen
+"""
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from kivy.clock import Clock
+from kivy.graphics.texture import Texture
+
+from metrics import metrics
+
+
+def _decode(discogs, release_id, size):
+    """Find and decode the best cached cover for `size` (runs on a worker thread).
+
+    Returns ((width, height), RGBA pixels, sized), or None if the cover
+    isn't downloaded yet. `sized` is False when the original stood in for
+    a size that hasn't been generated: it is shrunk to that size here, but
+    shouldn't be cached in place of the sized file.
+    """
+    from discogs_service import COVER_SIZES
+    from PIL import Image
+    path = discogs.cover_path(release_id, size)
+    if not path:
+        return None
+    sized = path == discogs.cover_file(release_id, size)
+    edge = None if sized else COVER_SIZES.get(size)
+    with metrics.timer('cover.decode'), Image.open(path) as img:
+        if edge:
+            img.draft('RGB', (edge, edge))
+            img.thumbnail((edge, edge))
+        img = img.convert('RGBA')
+        return img.size, img.tobytes(), sized
+
+
+class CoverTextureCache:
+    """GPU textures keyed by (release id, cover size) with an LRU memory budget.
+
+    Screens share one instance, so a cover shown in the grid, the detail
+    view and the jukebox is decoded and uploaded once until evicted.
+    """
+
+    def __init__(self, budget_mb=48):
+        self.budget = budget_mb * 1024 * 1024
+        self._textures = OrderedDict()  # (release_id, size) -> texture
+        self._used = 0
+        self._pending = {}              # (release_id, size) -> [(owner, callback)] being decoded
+        self._recheck = set()           # pending keys whose cover was downloaded meanwhile
+        self._waiting = {}              # owner -> (release_id, size, callback) not downloaded yet
+        self._decoder = ThreadPoolExecutor(max_workers=2, thread_name_prefix='covers-decode')
+
+    def get(self, release_id, size):
+        """Cached texture, or None"""
+        key = (release_id, size)
+        texture = self._textures.get(key)
+        if texture is not None:
+            self._textures.move_to_end(key)
+        return texture
+
+    def request(self, release_id, size, callback, owner=None):
+        """Deliver the cover texture to `callback(texture)` on the main thread.
+
+        Cached textures are delivered immediately. Otherwise the file is
+        found, checked and decoded on a worker thread, and only the GPU
+        upload happens here.
+        Covers that aren't downloaded yet are delivered once
+        `cover_downloaded` reports them.
+
+        `owner` (a card or screen) waits for one cover at a time: a new
+        request from it replaces the one it was still waiting on.
+        """
+        if owner is not None:
+            self._waiting.pop(owner, None)
+        
+        texture = self.get(release_id, size)
+        metrics.hit('texture_cache', texture is not None)
+        if texture is not None:
+            callback(texture)
+            return
+
+        key = (release_id, size)
+        if key in self._pending:
+            self._pending[key].append((owner, callback))
+            return
+
+        from kivy.app import App
+        app = App.get_running_app()
+        if not app.discogs:
+            self._wait(release_id, size, callback, owner)
+            return
+
+        self._pending[key] = [(owner, callback)]
+        future = self._decoder.submit(_decode, app.discogs, release_id, size)
+        future.add_done_callback(
+            lambda f: Clock.schedule_once(lambda dt: self._decoded(release_id, size, f), 0)
+        )
+
+    def cover_downloaded(self, release_id):
+        """A cover finished downloading - serve anyone waiting for it"""
+        for key in self._pending:
+            if key[0] == release_id:
+                # Its decode may have looked for the file before it landed
+                self._recheck.add(key)
+        waiting = [(owner, entry) for owner, entry in self._waiting.items() if entry[0] == release_id]
+        for owner, (_, size, callback) in waiting:
+            del self._waiting[owner]
+            self.request(release_id, size, callback, owner)
+
+    def _wait(self, release_id, size, callback, owner):
+        # Without an owner the callback itself is the key, so repeats don't pile up
+        self._waiting[callback if owner is None else owner] = (release_id, size, callback)
+
+    def _decoded(self, release_id, size, future):
+        key = (release_id, size)
+        callbacks = self._pending.pop(key, [])
+        recheck = key in self._recheck
+        self._recheck.discard(key)
+        try:
+            result = future.result()
+        except Exception as e:
+            print(f"Error decoding cover {release_id}: {e}")
+            # Re-download it and serve these callers once it arrives (an
+            # owner already waiting on a newer request keeps that one)
+            for owner, callback in callbacks:
+                if owner is None or owner not in self._waiting:
+                    self._wait(release_id, size, callback, owner)
+            self._quarantine(release_id)
+            return
+
+        if result is None:
+            # Not downloaded yet - serve these callers once it is
+            for owner, callback in callbacks:
+                if owner is not None and owner in self._waiting:
+                    continue
+                if recheck:
+                    self.request(release_id, size, callback, owner)
+                else:
+                    self._wait(release_id, size, callback, owner)
+            return
+
+        (width, height), pixels, sized = result
+        with metrics.timer('cover.upload'):
+            texture = Texture.create(size=(width, height), colorfmt='rgba')
+            texture.blit_buffer(pixels, colorfmt='rgba', bufferfmt='ubyte')
+            texture.flip_vertical()
+        if sized:
+            self.put(release_id, size, texture)
+
+        for _, callback in callbacks:
+            callback(texture)
+
+    def _quarantine(self, release_id):
+        from kivy.app import App
+        app = App.get_running_app()
+        if app.discogs:
+            app.discogs.quarantine_cover(release_id)
+
+    def put(self, release_id, size, texture):
+        key = (release_id, size)
+        old = self._textures.pop(key, None)
+        if old is not None:
+            self._used -= self._texture_bytes(old)
+
+        self._textures[key] = texture
+        self._used += self._texture_bytes(texture)
+
+        # Keep at least the texture just added, even if it alone is over budget
+        while self._used > self.budget and len(self._textures) > 1:
+            _, evicted = self._textures.popitem(last=False)
+            self._used -= self._texture_bytes(evicted)
+
+    def clear(self):
+        self._textures.clear()
+        self._used = 0
+        self._waiting.clear()
+        self._recheck.clear()
+
+    @staticmethod
+    def _texture_bytes(texture):
+        return texture.width * texture.height * 4
+
+
+cover_textures = CoverTextureCache()
+
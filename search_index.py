@@ -0,0 +1,164 @@
+"""
+Search Index
+Inverted index over the collection for instant as-you-type search
+"""
+import bisect
+import re
+import threading
+import unicodedata
+
+from metrics import metrics
+
+
+# How much a match in each field counts towards a record's rank
+FIELD_WEIGHTS = {
+    'artist': 4,
+    'title': 4,
+    'genres': 1,
+    'styles': 1,
+}
+
+# A whole-word match ranks above a prefix match in the same field
+EXACT_BONUS = 2
+
+_TOKEN_RE = re.compile(r'\w+')
+
+
+def tokenize(text):
+    """Lowercase, accent-folded word tokens ('Beyoncé - 4' -> ['beyonce', '4'])"""
+    text = unicodedata.normalize('NFKD', str(text).casefold())
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return _TOKEN_RE.findall(text)
+
+
+class SearchIndex:
+    """Token -> record postings with prefix lookup over a sorted vocabulary.
+
+    Each query word matches any indexed word it is a prefix of; a record
+    must match every query word. Results are ranked by field weight, then
+    by collection order.
+    """
+
+    def __init__(self, items=None, cache_size=256):
+        self.cache_size = cache_size
+        # The collection may be indexed on a loader thread while the UI searches
+        self._lock = threading.RLock()
+        self.build(items or [])
+
+    def build(self, items):
+        """Index `items` from scratch"""
+        with self._lock:
+            self._docs = []
+            self._front = []         # records added ahead of _docs, as docs -1, -2, ...
+            self._postings = {}      # token -> {doc: weight}
+            self._vocab = []
+            self._vocab_dirty = False
+            self._prefix_cache = {}
+            self._query_cache = {}
+            self.add_items(items)
+
+    def add_items(self, items, front=False):
+        """Index additional records without rebuilding.
+
+        With `front`, they rank ahead of the records already indexed, as
+        if they came first in the collection.
+        """
+        with self._lock:
+            for item in (reversed(items) if front else items):
+                if front:
+                    self._front.append(item)
+                    doc = -len(self._front)
+                else:
+                    doc = len(self._docs)
+                    self._docs.append(item)
+
+                for field, weight in FIELD_WEIGHTS.items():
+                    value = item.get(field)
+                    if not value:
+                        continue
+                    text = ' '.join(value) if isinstance(value, (list, tuple)) else value
+                    for token in tokenize(text):
+                        postings = self._postings.get(token)
+                        if postings is None:
+                            postings = self._postings[token] = {}
+                            self._vocab_dirty = True
+                        if postings.get(doc, 0) < weight:
+                            postings[doc] = weight
+
+            self.clear_cache()
+
+    def clear_cache(self):
+        """Forget cached query results; they are recomputed on demand"""
+        with self._lock:
+            self._prefix_cache.clear()
+            self._query_cache.clear()
+
+    def __len__(self):
+        return len(self._front) + len(self._docs)
+
+    def search(self, query, limit=None, offset=0):
+        """Records matching every word of `query`, best first"""
+        with self._lock:
+            ranked = self._ranked(query)
+            end = None if limit is None else offset + limit
+            return [self._docs[doc] if doc >= 0 else self._front[-doc - 1] for doc in ranked[offset:end]]
+
+    def count(self, query):
+        """Number of records matching `query`"""
+        with self._lock:
+            return len(self._ranked(query))
+
+    def _ranked(self, query):
+        tokens = tuple(tokenize(query))
+        if not tokens:
+            return []
+
+        ranked = self._query_cache.get(tokens)
+        metrics.hit('search_cache', ranked is not None)
+        if ranked is None:
+            ranked = self._rank(tokens)
+            if len(self._query_cache) >= self.cache_size:
+                self._query_cache.clear()
+            self._query_cache[tokens] = ranked
+        return ranked
+
+    def _rank(self, tokens):
+        """Doc numbers matching every token, best first"""
+        scores = None
+        for token in tokens:
+            matches = self._prefix_matches(token)
+            if scores is None:
+                scores = dict(matches)
+            else:
+                scores = {doc: score + matches[doc] for doc, score in scores.items() if doc in matches}
+            if not scores:
+                return []
+
+        return sorted(scores, key=lambda doc: (-scores[doc], doc))
+
+    def _prefix_matches(self, prefix):
+        """{doc: score} for every record with a word starting with `prefix`"""
+        cached = self._prefix_cache.get(prefix)
+        if cached is not None:
+            return cached
+
+        if self._vocab_dirty:
+            self._vocab = sorted(self._postings)
+            self._vocab_dirty = False
+
+        matches = {}
+        start = bisect.bisect_left(self._vocab, prefix)
+        for i in range(start, len(self._vocab)):
+            token = self._vocab[i]
+            if not token.startswith(prefix):
+                break
+            bonus = EXACT_BONUS if token == prefix else 0
+            for doc, weight in self._postings[token].items():
+                score = weight + bonus
+                if matches.get(doc, 0) < score:
+                    matches[doc] = score
+
+        if len(self._prefix_cache) >= self.cache_size:
+            self._prefix_cache.clear()
+        self._prefix_cache[prefix] = matches
+        return matches
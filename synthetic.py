@@ -0,0 +1,60 @@
+"""
+Synthetic Collection
+Generated collections with a realistic shape, shared by benchmark.py and mock_discogs.py
+"""
+import itertools
+import random
+
+from records import Record
+
+
+# Discogs genres with roughly their share of a typical collection, and some of their styles
+GENRES = {
+    'Rock': (30, ['Alternative Rock', 'Indie Rock', 'Classic Rock', 'Punk', 'Post-Punk', 'Hard Rock', 'Psychedelic Rock', 'Prog Rock']),
+    'Electronic': (20, ['House', 'Techno', 'Ambient', 'Synth-pop', 'Downtempo', 'Industrial', 'Disco', 'Electro']),
+    'Pop': (12, ['Indie Pop', 'Synth-pop', 'Ballad', 'Europop', 'Vocal']),
+    'Jazz': (9, ['Soul-Jazz', 'Hard Bop', 'Modal', 'Fusion', 'Free Jazz', 'Cool Jazz']),
+    'Funk / Soul': (8, ['Soul', 'Funk', 'Disco', 'Rhythm & Blues', 'Neo Soul']),
+    'Hip Hop': (6, ['Boom Bap', 'Conscious', 'Instrumental', 'Trip Hop', 'Gangsta']),
+    'Classical': (4, ['Baroque', 'Romantic', 'Modern', 'Opera', 'Contemporary']),
+    'Folk, World, & Country': (4, ['Folk', 'Country', 'Bluegrass', 'African', 'Celtic']),
+    'Reggae': (2, ['Roots Reggae', 'Dub', 'Ska', 'Dancehall']),
+    'Blues': (2, ['Chicago Blues', 'Delta Blues', 'Electric Blues']),
+    'Latin': (1, ['Bossa Nova', 'Salsa', 'Samba']),
+    'Stage & Screen': (1, ['Soundtrack', 'Score', 'Musical']),
+}
+
+WORDS = ('love night blue dream fire city heart sun moon black white wild river '
+         'gold electric summer ghost glass paper dance young road home ocean star '
+         'velvet silver broken echo neon forever secret island shadow thunder').split()
+
+
+def synthetic_collection(size, seed=1):
+    """`size` Records with a skewed artist and genre/style distribution"""
+    rng = random.Random(seed)
+    genre_names = list(GENRES)
+    genre_weights = [GENRES[genre][0] for genre in genre_names]
+
+    # A few artists own many records, most own one or two
+    artists = [f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} {n}"
+               for n in range(max(1, size // 3))]
+    artist_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(artists))))
+
+    records = []
+    for n in range(size):
+        genres = set(rng.choices(genre_names, genre_weights, k=rng.choice((1, 1, 1, 2))))
+        styles = set()
+        for genre in genres:
+            styles.update(rng.sample(GENRES[genre][1], rng.randint(0, 2)))
+        title = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 4))).title()
+        records.append(Record(
+            id=100000 + n,
+            instance_id=900000 + n,
+            title=title,
+            artist=rng.choices(artists, cum_weights=artist_weights)[0],
+            year=rng.randint(1955, 2025),
+            cover=f"https://i.discogs.com/{n}.jpg",
+            genres=sorted(genres),
+            styles=sorted(styles),
+        ))
+    return records